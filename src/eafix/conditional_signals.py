@@ -12,12 +12,197 @@ lifting functions contain TODO markers for future work.
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from itertools import chain, starmap
 from pathlib import Path
 from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
+import bisect
 import csv
+import functools
+import hashlib
+import heapq
 import math
+import os
+import threading
+
+try:  # the historical analysis needs numpy/pandas; demo scans do not
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pragma: no cover - exercised only without the deps
+    np = None
+    pd = None
+
+# Number of analysed slices kept in memory per scanner instance
+_ANALYSIS_CACHE_SIZE = 16
+
+# Below this many bars the trigger configs are analysed serially; thread
+# hand-off costs more than the overlap gains on short histories
+_PARALLEL_MIN_BARS = 50_000
+
+_analysis_pool: Optional[ThreadPoolExecutor] = None
+_analysis_pool_lock = threading.Lock()
+
+_CSV_HEADER = "symbol,trigger,outcome,dir,state,succ,tot,p"
+# Matches the default ``csv.writer`` line terminator used by the demo writer
+_CSV_NEWLINE = "\r\n"
+_CSV_BUFFER_SIZE = 1 << 20
+_CSV_CHUNK_ROWS = 10_000
+
+# ---------------------------------------------------------------------------
+# Scan configuration
+# ---------------------------------------------------------------------------
+
+TRIGGER_CONFIGS: Tuple[Dict, ...] = (
+    {"name": "burst_10_15", "burst_pips": 10, "burst_window_min": 15},
+    {"name": "burst_15_30", "burst_pips": 15, "burst_window_min": 30},
+    {"name": "burst_20_45", "burst_pips": 20, "burst_window_min": 45},
+    {"name": "momentum_5_10", "momentum_pips": 5, "momentum_window_min": 10},
+    {"name": "reversal_10_20", "reversal_pips": 10, "reversal_window_min": 20},
+)
+PRICE_COLUMNS: Tuple[str, ...] = ("close", "high", "low")
+FWD_WINDOWS: Tuple[int, ...] = (15, 30, 60)  # minutes
+FWD_THRESHOLDS: Tuple[int, ...] = (5, 10, 15)  # pips
+
+def _shared_analysis_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool for per-config analysis, creating it once."""
+    global _analysis_pool
+    if _analysis_pool is None:
+        with _analysis_pool_lock:
+            if _analysis_pool is None:
+                _analysis_pool = ThreadPoolExecutor(
+                    max_workers=min(len(TRIGGER_CONFIGS), os.cpu_count() or 1),
+                    thread_name_prefix="conditional-scan",
+                )
+    return _analysis_pool
+
+
+# ---------------------------------------------------------------------------
+# Numeric kernels
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _numba_kernels() -> Optional[Dict[str, Callable]]:
+    """Compile the optional numba kernels on first use.
+
+    Returns ``None`` when numba is not installed; callers then fall back to
+    the equivalent pandas expressions.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    @njit
+    def rolling_std(a, window):
+        # Sliding-window Welford update: one add and one remove per step
+        n = a.shape[0]
+        out = np.full(n, np.nan)
+        if n < window or window < 2:
+            return out
+        mean = 0.0
+        m2 = 0.0
+        for i in range(window):
+            delta = a[i] - mean
+            mean += delta / (i + 1)
+            m2 += delta * (a[i] - mean)
+        out[window - 1] = math.sqrt(max(m2, 0.0) / (window - 1))
+        for i in range(window, n):
+            old = a[i - window]
+            new = a[i]
+            new_mean = mean + (new - old) / window
+            m2 += (new - old) * (new - new_mean + old - mean)
+            mean = new_mean
+            out[i] = math.sqrt(max(m2, 0.0) / (window - 1))
+        return out
+
+    @njit
+    def simple_rsi(a, period):
+        # Rolling means of percentage gains/losses kept as running sums
+        n = a.shape[0]
+        out = np.full(n, np.nan)
+        gain_sum = 0.0
+        loss_sum = 0.0
+        for i in range(n):
+            ch = a[i] / a[i - 1] - 1.0 if i > 0 else 0.0
+            if ch > 0:
+                gain_sum += ch
+            elif ch < 0:
+                loss_sum -= ch
+            j = i - period
+            if j > 0:
+                old = a[j] / a[j - 1] - 1.0
+                if old > 0:
+                    gain_sum -= old
+                elif old < 0:
+                    loss_sum += old
+            if i >= period - 1:
+                if loss_sum != 0.0:
+                    out[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+                elif gain_sum != 0.0:
+                    out[i] = 100.0
+        return out
+
+    return {"rolling_std": rolling_std, "simple_rsi": simple_rsi}
+
+
+def _rolling_std(close: 'pd.Series', window: int) -> 'pd.Series':
+    """Sample standard deviation of *close* over a trailing *window*."""
+    kernels = _numba_kernels()
+    values = close.to_numpy(dtype=np.float64)
+    if kernels is None or np.isnan(values).any():
+        return close.rolling(window).std()
+    return pd.Series(kernels["rolling_std"](values, window), index=close.index)
+
+
+def _simple_rsi(close: 'pd.Series', period: int = 14) -> 'pd.Series':
+    """RSI approximation from rolling means of percentage gains and losses.
+
+    Bars without a defined ratio (no movement over the window) are ``NaN``.
+    """
+    values = close.to_numpy(dtype=np.float64)
+    kernels = _numba_kernels()
+    if kernels is not None and not np.isnan(values).any():
+        return pd.Series(kernels["simple_rsi"](values, period), index=close.index)
+
+    change = np.zeros_like(values)
+    change[1:] = values[1:] / values[:-1] - 1.0
+    gain = np.where(change > 0, change, 0.0)
+    loss = np.where(change < 0, -change, 0.0)
+    # Trailing window sums; the 1/period factor of the means cancels in rs
+    kernel = np.ones(period)
+    gain_sum = np.convolve(gain, kernel)[:values.size]
+    loss_sum = np.convolve(loss, kernel)[:values.size]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+    rsi[:period - 1] = np.nan
+    return pd.Series(rsi, index=close.index)
+
+
+def _quantiles(values: 'np.ndarray', qs: Tuple[float, ...]) -> Tuple[float, ...]:
+    """Linearly interpolated quantiles of the non-NaN *values*.
+
+    Matches ``pd.Series.quantile`` but selects all required order
+    statistics with a single ``np.partition`` call instead of one
+    selection per quantile.
+    """
+    valid = values[~np.isnan(values)]
+    if valid.size == 0:
+        return tuple(math.nan for _ in qs)
+    last = valid.size - 1
+    positions = [q * last for q in qs]
+    kth = sorted({int(math.floor(pos)) for pos in positions} | {min(int(math.ceil(pos)), last) for pos in positions})
+    ordered = np.partition(valid, kth)
+    result = []
+    for pos in positions:
+        lo = int(math.floor(pos))
+        a, b = ordered[lo], ordered[min(lo + 1, last)]
+        t = pos - lo
+        # Same lerp as numpy's "linear" method so thresholds are bit-identical
+        result.append(float(b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t))
+    return tuple(result)
+
 
 # ---------------------------------------------------------------------------
 # Data containers
@@ -59,7 +244,15 @@ class ConditionalRow:
 # State helpers
 # ---------------------------------------------------------------------------
 
-def state_rsi_bucket(rsi: float, buckets: Iterable[Tuple[int, int]] = ((0, 30), (30, 70), (70, 100))) -> str:
+_RSI_BUCKETS: Tuple[Tuple[int, int], ...] = ((0, 30), (30, 70), (70, 100))
+_RSI_BOUNDARIES: Tuple[int, ...] = (30, 70)
+_RSI_LABELS: Tuple[str, ...] = ("RSI_0_30", "RSI_30_70", "RSI_70_100")
+# Scanner state edges: rsi <= 30, 30 < rsi < 70 and rsi >= 70.  The upper
+# edge sits one ulp below 70 so a single left-sided search keeps 70 high.
+_RSI_STATE_EDGES = (30.0, math.nextafter(70.0, 0.0))
+
+
+def state_rsi_bucket(rsi: float, buckets: Iterable[Tuple[int, int]] = _RSI_BUCKETS) -> str:
     """Bucketise an RSI value.
 
     Parameters
@@ -69,6 +262,11 @@ def state_rsi_bucket(rsi: float, buckets: Iterable[Tuple[int, int]] = ((0, 30),
     buckets : iterable of (low, high)
         Ranges that map to string buckets.
     """
+    if buckets is _RSI_BUCKETS:
+        # Default buckets: bisect into precomputed labels
+        if 0 <= rsi < 100:
+            return _RSI_LABELS[bisect.bisect_right(_RSI_BOUNDARIES, rsi)]
+        return "RSI_OUT_OF_RANGE"
     for low, high in buckets:
         if low <= rsi < high:
             return f"RSI_{low}_{high}"
@@ -126,73 +324,122 @@ class ConditionalScanner:
 
     def _analyze_historical_data(self, symbol: str, data: List) -> List[ConditionalRow]:
         """Analyze historical data to generate conditional probabilities."""
-        import pandas as pd
-        import numpy as np
-        
+        if np is None or pd is None:
+            raise ImportError("Historical analysis requires numpy and pandas")
+
         # Convert to DataFrame for analysis
         df = pd.DataFrame(data)
         if df.empty:
             return []
-        
-        results = []
+
+        # Give each price column its own C-contiguous float64 buffer so the
+        # rolling reductions and numba kernels below read it without copies
+        for column in PRICE_COLUMNS:
+            if column in df.columns:
+                df[column] = np.ascontiguousarray(df[column].to_numpy(dtype=np.float64))
+
+        # Repeat scans of the same slice reuse the previous analysis.  The
+        # cache holds field tuples and every call gets fresh rows, so a
+        # caller adjusting its rows cannot change what later calls see.
+        cache_key = self._data_key(symbol, df)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return list(starmap(ConditionalRow, cached))
+
         trigger_configs = self._get_trigger_configs()
-        
-        for config in trigger_configs:
-            # Calculate triggers and outcomes for each configuration
+        # 0/1 masks go through float BLAS kernels; float32 counts are exact
+        # below 2**24 bars, beyond that float64 keeps them exact.
+        mask_dtype = np.float32 if len(df) < 2**24 else np.float64
+
+        # State buckets do not depend on the trigger configuration
+        states = self._generate_state_buckets(df)
+        state_names = list(states)
+        state_bits = np.stack([np.asarray(m, dtype=bool) for m in states.values()]).astype(mask_dtype)
+
+        # Forward outcomes use fixed windows/thresholds shared by every config
+        outcomes = self._calculate_outcomes(df, trigger_configs[0])
+        outcome_names = list(outcomes)
+        outcome_bits = np.stack([np.asarray(m, dtype=bool) for m in outcomes.values()]).astype(mask_dtype)
+
+        def process_config(config: Dict) -> List[ConditionalRow]:
+            # Calculate triggers for each configuration
             triggers = self._calculate_triggers(df, config)
-            outcomes = self._calculate_outcomes(df, config)
-            
-            # Generate state buckets
-            states = self._generate_state_buckets(df)
-            
-            # Calculate probabilities for each trigger/outcome/state combination
-            for trigger_name, trigger_data in triggers.items():
-                for outcome_name, outcome_data in outcomes.items():
-                    for state_name, state_mask in states.items():
-                        # Filter data based on conditions
-                        combined_mask = trigger_data & state_mask
-                        
-                        if combined_mask.sum() >= self.cfg.min_samples:
-                            # Calculate success rate
-                            successes = (combined_mask & outcome_data).sum()
-                            total = combined_mask.sum()
-                            
-                            # Apply Laplace smoothing
-                            probability = self.laplace_smoothing(successes, total)
-                            
-                            # Determine direction based on trigger/outcome combination
-                            direction = self._determine_direction(trigger_name, outcome_name)
-                            
-                            row = ConditionalRow(
-                                trigger=trigger_name,
-                                outcome=outcome_name, 
-                                direction=direction,
-                                state=state_name,
-                                succ=int(successes),
-                                tot=int(total),
-                                p=probability
-                            )
-                            results.append(row)
-        
+            if not triggers:
+                return []
+
+            trigger_names = list(triggers)
+            trigger_bits = np.stack([np.asarray(m, dtype=bool) for m in triggers.values()]).astype(mask_dtype)
+
+            # Count every trigger/state intersection in one matrix product and
+            # every trigger/outcome/state intersection in one contraction,
+            # replacing the per-cell boolean mask reductions.
+            totals = (trigger_bits @ state_bits.T).astype(np.int64)
+            successes = np.einsum(
+                "tn,on,sn->tos", trigger_bits, outcome_bits, state_bits, optimize=True
+            ).astype(np.int64)
+
+            # Keep (trigger, outcome, state) ordering of the original scan
+            t_idx, o_idx, s_idx = np.nonzero(
+                np.broadcast_to((totals >= self.cfg.min_samples)[:, None, :], successes.shape)
+            )
+            if t_idx.size == 0:
+                return []
+            tot = totals[t_idx, s_idx]
+            succ = successes[t_idx, o_idx, s_idx]
+            probability = self.laplace_smoothing(succ, tot)
+
+            # Direction depends only on the trigger/outcome pair
+            directions = [
+                [self._determine_direction(trigger_name, outcome_name) for outcome_name in outcome_names]
+                for trigger_name in trigger_names
+            ]
+
+            rows = []
+            for t, o, s, n_succ, n_tot, p in zip(t_idx, o_idx, s_idx, succ.tolist(), tot.tolist(), probability.tolist()):
+                rows.append(ConditionalRow(
+                    trigger=trigger_names[t],
+                    outcome=outcome_names[o],
+                    direction=directions[t][o],
+                    state=state_names[s],
+                    succ=n_succ,
+                    tot=n_tot,
+                    p=p,
+                ))
+            return rows
+
+        # Trigger configs are independent and their pandas/BLAS work releases
+        # the GIL, so long histories run them on the shared pool; map() keeps
+        # config order either way.
+        if len(df) >= _PARALLEL_MIN_BARS and (os.cpu_count() or 1) > 1:
+            per_config = _shared_analysis_pool().map(process_config, trigger_configs)
+        else:
+            per_config = map(process_config, trigger_configs)
+        results = list(chain.from_iterable(per_config))
+
         # Sort by probability descending
         results.sort(key=lambda r: r.p, reverse=True)
+
+        if len(self._cache) >= _ANALYSIS_CACHE_SIZE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = tuple(
+            (r.trigger, r.outcome, r.direction, r.state, r.succ, r.tot, r.p) for r in results
+        )
         return results
 
-    def _get_trigger_configs(self) -> List[Dict]:
+    def _data_key(self, symbol: str, df: 'pd.DataFrame') -> Tuple:
+        """Return a cache key identifying *df*'s content for this scan."""
+        digest = hashlib.blake2b(
+            pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(),
+            digest_size=16,
+        ).hexdigest()
+        return symbol, tuple(df.columns), len(df), self.cfg.min_samples, digest
+
+    def _get_trigger_configs(self) -> Tuple[Dict, ...]:
         """Get trigger configurations for scanning."""
-        return [
-            {"name": "burst_10_15", "burst_pips": 10, "burst_window_min": 15},
-            {"name": "burst_15_30", "burst_pips": 15, "burst_window_min": 30},
-            {"name": "burst_20_45", "burst_pips": 20, "burst_window_min": 45},
-            {"name": "momentum_5_10", "momentum_pips": 5, "momentum_window_min": 10},
-            {"name": "reversal_10_20", "reversal_pips": 10, "reversal_window_min": 20},
-        ]
+        return TRIGGER_CONFIGS
 
     def _calculate_triggers(self, df: 'pd.DataFrame', config: Dict) -> Dict:
         """Calculate trigger conditions on historical data."""
-        import pandas as pd
-        import numpy as np
-        
         triggers = {}
         
         # Price movement triggers
@@ -201,8 +448,12 @@ class ConditionalScanner:
             window = config["burst_window_min"]
             pips = config["burst_pips"]
             
-            # Rolling price change calculation
-            price_change = df['close'].rolling(window).apply(lambda x: abs(x.iloc[-1] - x.iloc[0]) * 10000)
+            # Rolling price change between the first and last bar of each
+            # window, vectorised instead of a Python callback per window
+            close = df['close']
+            price_change = (close - close.shift(window - 1)).abs() * 10000
+            if close.isna().any():
+                price_change[close.rolling(window).count() < window] = np.nan
             triggers[config["name"]] = price_change >= pips
             
         elif "momentum_pips" in config:
@@ -225,22 +476,16 @@ class ConditionalScanner:
 
     def _calculate_outcomes(self, df: 'pd.DataFrame', config: Dict) -> Dict:
         """Calculate outcome conditions on historical data.""" 
-        import pandas as pd
-        import numpy as np
-        
         outcomes = {}
         
         # Forward-looking outcome calculations (avoiding look-ahead bias)
-        fwd_windows = [15, 30, 60]  # minutes
-        fwd_thresholds = [5, 10, 15]  # pips
-        
-        for window in fwd_windows:
-            for threshold in fwd_thresholds:
-                # Calculate forward price movement
-                future_price = df['close'].shift(-window)
-                current_price = df['close']
-                fwd_move = (future_price - current_price) * 10000
-                
+        for window in FWD_WINDOWS:
+            # Calculate forward price movement
+            future_price = df['close'].shift(-window)
+            current_price = df['close']
+            fwd_move = (future_price - current_price) * 10000
+
+            for threshold in FWD_THRESHOLDS:
                 # Positive and negative outcomes
                 outcomes[f"fwd_up_{threshold}_{window}"] = fwd_move >= threshold
                 outcomes[f"fwd_down_{threshold}_{window}"] = fwd_move <= -threshold
@@ -249,33 +494,29 @@ class ConditionalScanner:
 
     def _generate_state_buckets(self, df: 'pd.DataFrame') -> Dict:
         """Generate state bucket conditions."""
-        import pandas as pd
-        import numpy as np
-        
         states = {}
         
         # RSI-based states
         if 'rsi' in df.columns:
             rsi = df['rsi']
-            states["RSI_0_30"] = rsi <= 30
-            states["RSI_30_70"] = (rsi > 30) & (rsi < 70)
-            states["RSI_70_100"] = rsi >= 70
         else:
             # Calculate simple RSI approximation
-            price_change = df['close'].pct_change()
-            gain = price_change.where(price_change > 0, 0).rolling(14).mean()
-            loss = (-price_change.where(price_change < 0, 0)).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            states["RSI_0_30"] = rsi <= 30
-            states["RSI_30_70"] = (rsi > 30) & (rsi < 70) 
-            states["RSI_70_100"] = rsi >= 70
-        
+            rsi = _simple_rsi(df['close'], 14)
+
+        # One searchsorted pass labels every bar; the masks are then cheap
+        # integer compares.  NaN RSI values belong to no bucket.
+        values = rsi.to_numpy(dtype=np.float64)
+        labels = np.searchsorted(_RSI_STATE_EDGES, values, side="left")
+        labels[np.isnan(values)] = len(_RSI_STATE_EDGES) + 1
+        states["RSI_0_30"] = labels == 0
+        states["RSI_30_70"] = labels == 1
+        states["RSI_70_100"] = labels == 2
+
         # Volatility-based states
-        volatility = df['close'].rolling(20).std() * 10000
-        vol_low = volatility <= volatility.quantile(0.33)
-        vol_high = volatility >= volatility.quantile(0.67)
+        volatility = _rolling_std(df['close'], 20) * 10000
+        vol_lo, vol_hi = _quantiles(volatility.to_numpy(), (0.33, 0.67))
+        vol_low = volatility <= vol_lo
+        vol_high = volatility >= vol_hi
         
         states["VOL_LOW"] = vol_low
         states["VOL_NORMAL"] = ~vol_low & ~vol_high
@@ -304,27 +545,30 @@ class ConditionalScanner:
 
     def _write_results(self, table_path: Path, top_path: Path, rows: List[ConditionalRow]):
         """Write analysis results to CSV files."""
-        with table_path.open("w", newline="") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(["symbol", "trigger", "outcome", "dir", "state", "succ", "tot", "p"])
-            for row in rows:
-                writer.writerow([
-                    table_path.stem.replace("_conditional_table", ""),
-                    row.trigger, row.outcome, row.direction, row.state, 
-                    row.succ, row.tot, f"{row.p:.4f}"
-                ])
-        
-        # Write top results (highest probability entries)
-        top_rows = sorted(rows, key=lambda r: (r.p, r.tot), reverse=True)[:200]
-        with top_path.open("w", newline="") as fh:
-            writer = csv.writer(fh)
-            writer.writerow(["symbol", "trigger", "outcome", "dir", "state", "succ", "tot", "p"])
-            for row in top_rows:
-                writer.writerow([
-                    top_path.stem.replace("_conditional_top", ""),
-                    row.trigger, row.outcome, row.direction, row.state,
-                    row.succ, row.tot, f"{row.p:.4f}"
-                ])
+        self._write_csv(table_path, table_path.stem.replace("_conditional_table", ""), rows)
+
+        # Write top results (highest probability entries); a bounded heap
+        # avoids re-sorting the full table just to take its head
+        top_rows = heapq.nlargest(200, rows, key=lambda r: (r.p, r.tot))
+        self._write_csv(top_path, top_path.stem.replace("_conditional_top", ""), top_rows)
+
+    @staticmethod
+    def _write_csv(path: Path, symbol: str, rows: List[ConditionalRow]) -> None:
+        """Stream *rows* to *path* as encoded CSV chunks.
+
+        Trigger, outcome and state names are internal identifiers without
+        separators, so no quoting is required and the rows can be joined
+        directly instead of going through :class:`csv.writer` per row.
+        """
+        with path.open("wb", buffering=_CSV_BUFFER_SIZE) as fh:
+            fh.write((_CSV_HEADER + _CSV_NEWLINE).encode())
+            for start in range(0, len(rows), _CSV_CHUNK_ROWS):
+                lines = [
+                    f"{symbol},{r.trigger},{r.outcome},{r.direction},{r.state},{r.succ},{r.tot},{r.p:.4f}"
+                    for r in rows[start:start + _CSV_CHUNK_ROWS]
+                ]
+                lines.append("")
+                fh.write(_CSV_NEWLINE.join(lines).encode())
 
     def _write_demo_headers(self, table_path: Path, top_path: Path, symbol: str):
         """Write demo data for testing when no historical data available."""
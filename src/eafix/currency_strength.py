@@ -8,8 +8,54 @@ real trading system would expect but avoids heavy dependencies.
 
 from __future__ import annotations
 
-from collections import defaultdict
-from typing import Dict, Iterable, Mapping
+import functools
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+# Pair baskets -----------------------------------------------------------------
+#
+# Each basket gets its own currency vocabulary, so strength is accumulated in
+# fixed-size lists sized by the currencies that basket actually quotes.
+
+
+def _pair_currencies(pair: str) -> Optional[Tuple[str, str]]:
+    """Return ``(base, quote)`` for *pair* or ``None`` if invalid."""
+    if len(pair) != 6:
+        return None
+    return pair[:3], pair[3:]
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled_pairs(
+    pairs: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[int, ...], Tuple[int, ...], Optional[Tuple[int, ...]]]:
+    """Resolve a basket of pair symbols to currency index tuples.
+
+    Returns ``(names, base_idx, quote_idx, keep)`` where the indices point
+    into ``names``, the basket's currencies in order of first appearance,
+    and ``keep`` lists the positions of valid pairs, or is ``None`` when
+    every pair is valid.  Callers usually pass the same basket on every
+    update, so validation and lookups happen once per basket rather than
+    once per call.
+    """
+    index: Dict[str, int] = {}
+    base_idx: List[int] = []
+    quote_idx: List[int] = []
+    keep: List[int] = []
+    for i, pair in enumerate(pairs):
+        currencies = _pair_currencies(pair)
+        if currencies is None:
+            continue
+        base, quote = currencies
+        base_idx.append(index.setdefault(base, len(index)))
+        quote_idx.append(index.setdefault(quote, len(index)))
+        keep.append(i)
+    return (
+        tuple(index),
+        tuple(base_idx),
+        tuple(quote_idx),
+        None if len(keep) == len(pairs) else tuple(keep),
+    )
 
 
 def calc_currency_strength(pair_changes: Mapping[str, float]) -> Dict[str, float]:
@@ -21,26 +67,40 @@ def calc_currency_strength(pair_changes: Mapping[str, float]) -> Dict[str, float
         Keys are pair symbols like ``"EURUSD"`` and values are percentage
         changes over some window.
     """
-    strength: Dict[str, float] = defaultdict(float)
-    for pair, pct in pair_changes.items():
-        if len(pair) != 6:
-            continue
-        base, quote = pair[:3], pair[3:]
-        strength[base] += pct
-        strength[quote] -= pct
-    return dict(strength)
+    names, base_idx, quote_idx, keep = _compiled_pairs(tuple(pair_changes))
+    changes = list(pair_changes.values())
+    if keep is not None:
+        changes = [changes[i] for i in keep]
+    if not changes:
+        return {}
+
+    # Fixed-size accumulators indexed by currency, no per-pair hashing.  A
+    # plain loop beats numpy here: converting a basket to arrays costs more
+    # than the accumulation itself, even for thousands of pairs.
+    totals = [0.0] * len(names)
+    for base, quote, pct in zip(base_idx, quote_idx, changes):
+        totals[base] += pct
+        totals[quote] -= pct
+    return dict(zip(names, totals))
 
 
 # Oscillator helpers -----------------------------------------------------------
 
 def zscore(values: Iterable[float]) -> float:
-    vals = list(values)
-    if not vals:
-        return 0.0
-    mean = sum(vals) / len(vals)
-    var = sum((v - mean) ** 2 for v in vals) / len(vals)
-    std = var ** 0.5
-    if std == 0:
-        return 0.0
-    return (vals[-1] - mean) / std
+    """Return the z-score of the last value against the whole series.
 
+    Uses Welford's single-pass update so *values* may be any iterable and
+    is never materialised into a list.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    last = 0.0
+    for last in values:
+        n += 1
+        delta = last - mean
+        mean += delta / n
+        m2 += delta * (last - mean)
+    if n == 0 or m2 <= 0:
+        return 0.0
+    return (last - mean) / (m2 / n) ** 0.5
@@ -12,17 +12,147 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import sqlite3
 import time
 import threading
+from array import array
+from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from itertools import count, starmap
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from contextlib import contextmanager
 
 from .conditional_signals import ConditionalRow
 
+try:  # orjson is optional; the standard library json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Rows handed to a single executemany() call when bulk inserting ticks
+TICK_BATCH_SIZE = 10_000
+
+# Table layouts, formatted with the table name so migrations can build a
+# replacement next to a legacy table.  Times are INTEGER microseconds since
+# the Unix epoch.
+PROBABILITY_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        trigger_type TEXT NOT NULL,
+        outcome TEXT NOT NULL,
+        direction TEXT NOT NULL,
+        state TEXT NOT NULL,
+        successes INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        probability REAL NOT NULL,
+        created_at INTEGER NOT NULL
+    )
+"""
+
+# Materialized top-N rows per symbol, refreshed on every write
+PROBABILITY_TOP_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        symbol TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        trigger_type TEXT NOT NULL,
+        outcome TEXT NOT NULL,
+        direction TEXT NOT NULL,
+        state TEXT NOT NULL,
+        successes INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        probability REAL NOT NULL,
+        PRIMARY KEY (symbol, rank)
+    ) WITHOUT ROWID
+"""
+
+# Ticks are clustered on (symbol, timestamp, seq).  Symbol-major clustering
+# keeps each symbol's ticks in a contiguous key range, so per-symbol reads
+# touch the same pages a table-per-symbol shard would, while retention
+# deletes and ad-hoc queries keep a single table to target.  seq takes the
+# place of the rowid so ticks sharing a timestamp are all kept; migrated
+# rowid tables carry their id over as seq.
+TICK_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        symbol TEXT NOT NULL,
+        bid REAL NOT NULL,
+        ask REAL NOT NULL,
+        spread REAL NOT NULL,
+        timestamp INTEGER NOT NULL,
+        seq INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (symbol, timestamp, seq)
+    ) WITHOUT ROWID
+"""
+
+SYSTEM_CONFIG_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        name TEXT PRIMARY KEY,
+        config_data TEXT NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+"""
+
+# Symbol of a performance context, for indexed filtering.  Contexts holding
+# NaN or infinities are stored as Python's json writes them, which SQLite's
+# JSON functions reject, so they are guarded with json_valid().
+CTX_SYMBOL_EXPR = "CASE WHEN json_valid(context) THEN json_extract(context, '$.symbol') END"
+
+PERFORMANCE_LOG_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        metric_name TEXT NOT NULL,
+        value REAL NOT NULL,
+        context TEXT,
+        timestamp INTEGER NOT NULL,
+        ctx_symbol TEXT GENERATED ALWAYS AS (%s) VIRTUAL
+    )
+""" % CTX_SYMBOL_EXPR
+
+TABLE_DDL = {
+    "probability_tables": PROBABILITY_TABLE_DDL,
+    "probability_top": PROBABILITY_TOP_DDL,
+    "tick_data": TICK_TABLE_DDL,
+    "system_config": SYSTEM_CONFIG_DDL,
+    "performance_log": PERFORMANCE_LOG_DDL,
+}
+
+# Time column of each table; legacy databases stored these as ISO text
+TIME_COLUMNS = {
+    "probability_tables": "created_at",
+    "tick_data": "timestamp",
+    "system_config": "updated_at",
+    "performance_log": "timestamp",
+}
+
+# Rows per symbol kept in the materialized probability_top table
+PROBABILITY_TOP_N = 200
+
+# Seconds before a symbol without a probability table is looked up again;
+# another process may have stored one in the meantime
+PROBABILITY_SYMBOL_RECHECK_SECONDS = 5.0
+# Unknown symbols whose last check time is remembered; the oldest is dropped
+PROBABILITY_SYMBOL_CHECKS_MAX = 1024
+
+SQL_INSERT_TICK = """
+    INSERT INTO tick_data (symbol, bid, ask, spread, timestamp, seq)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Settings that SQLite keeps per connection, applied when a pooled
+# connection is first opened
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # Balance safety and speed under WAL
+    "PRAGMA cache_size=10000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=30000",  # 30 second timeout for locks
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA secure_delete=OFF",  # Retention deletes need not zero-fill pages
+)
+
 
 @dataclass
 class DatabaseConfig:
@@ -30,8 +160,12 @@ class DatabaseConfig:
     db_path: str = "trading_system.db"
     connection_timeout: float = 30.0
     max_connections: int = 10
+    statement_cache_size: int = 256  # Prepared statements kept per connection
+    tick_flush_size: int = 5000  # Queued ticks written per flusher transaction
+    tick_flush_interval_ms: float = 50.0  # Longest a queued tick waits for a flush
     vacuum_interval_hours: int = 24
     backup_interval_hours: int = 6
+    optimize_interval_hours: int = 6
     performance_target_ms: float = 100.0
     
     # Table settings
@@ -40,6 +174,68 @@ class DatabaseConfig:
     log_retention_days: int = 30
 
 
+def _json_default(value: Any) -> Any:
+    """Encode numpy scalars and arrays as their Python equivalents."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialise *value* to JSON text, using orjson when it is installed.
+
+    Numpy values are encoded as Python numbers and lists.  Values orjson
+    rejects, and output containing ``null`` (which orjson also writes for
+    NaN and infinities), go through :func:`json.dumps`, so NaN is stored
+    as ``NaN`` as before.
+    """
+    if orjson is not None:
+        try:
+            text = orjson.dumps(
+                value, default=_json_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except TypeError:
+            return json.dumps(value, default=_json_default)
+        if b"null" not in text:
+            return text.decode()
+    return json.dumps(value, default=_json_default)
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    """Parse JSON text, using orjson when it is installed.
+
+    Text orjson rejects, such as the ``NaN`` tokens :func:`json.dumps`
+    writes, is parsed by :func:`json.loads`.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _epoch_us(moment: Optional[datetime] = None) -> int:
+    """Return *moment* (default: now) as integer microseconds since the epoch."""
+    if moment is None:
+        return time.time_ns() // 1000
+    return int(moment.timestamp()) * 1_000_000 + moment.microsecond
+
+
+def _iso_from_us(value: int) -> str:
+    """Render stored epoch microseconds as a local ISO-8601 string."""
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros).isoformat()
+
+
+def _iso_to_us(value: Any) -> Any:
+    """Convert a legacy ISO text timestamp to epoch microseconds."""
+    if isinstance(value, str):
+        return _epoch_us(datetime.fromisoformat(value))
+    return value
+
+
 class DatabaseManager:
     """Production database manager with optimized queries and connection pooling."""
 
@@ -48,37 +244,95 @@ class DatabaseManager:
         self.logger = logging.getLogger(__name__)
         self.db_path = Path(self.config.db_path)
         
-        # Connection management with better concurrency control
-        self._connection_pool: List[sqlite3.Connection] = []
-        self._pool_lock = threading.RLock()  # Use RLock for nested acquisitions
+        # Connection management: WAL lets readers run alongside the single
+        # writer, so writes are serialized on one connection while reads draw
+        # from their own query_only pool and never queue behind a commit
+        reader_slots = max(1, self.config.max_connections - 1)
+        self._writer_pool: deque = deque(maxlen=1)
+        self._reader_pool: deque = deque(maxlen=reader_slots)
+        self._writer_slots = threading.Semaphore(1)
+        self._reader_slots = threading.Semaphore(reader_slots)
+        self._writer_owner = threading.local()  # .conn: writer held by this thread
         self._active_connections: Dict[int, sqlite3.Connection] = {}
         self._maintenance_thread: Optional[threading.Thread] = None
         self._maintenance_active = False
+        self._maintenance_wake = threading.Event()
         self._shutdown_requested = False
         
-        # Performance metrics
-        self._query_stats = {
-            'total_queries': 0,
-            'avg_query_time_ms': 0.0,
-            'slow_queries': 0,
-            'last_query_time': None
-        }
+        # Ticks queued by store_tick_data() and written in batches by the flusher
+        self._tick_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._tick_cond = threading.Condition()
+        self._ticks_queued = 0
+        # Tie-breaker for ticks sharing a timestamp; seeded from the clock so
+        # it does not repeat across restarts or clash with migrated row ids
+        self._tick_seq = count(time.time_ns())
+        self._ticks_written = 0
+        self._ticks_failed = 0  # Queued ticks whose batch failed to commit
+        self._ticks_failed_reported = 0  # _ticks_failed as of the last flush_ticks()
+        self._tick_flusher: Optional[threading.Thread] = None
+        self._tick_flusher_stop = threading.Event()
+        
+        # Performance metrics: (total queries, total microseconds, slow
+        # queries); averages are derived only when stats are requested
+        self._stats_lock = threading.Lock()
+        self._query_counters = array('Q', [0, 0, 0])
+        self._last_query_time: Optional[datetime] = None
+        
+        # Symbols with a stored probability table (loaded at startup, grown by
+        # store_probability_table and by rechecks) so lookups for unknown
+        # symbols skip the DB; a miss is rechecked at most every
+        # PROBABILITY_SYMBOL_RECHECK_SECONDS
+        self._known_prob_symbols: set = set()
+        self._prob_symbols_checked: Dict[str, float] = {}
+        self._prob_symbols_loaded_at = 0.0
+        self._symbols_lock = threading.Lock()
         
         # Initialize database
         self._initialize_database()
+        self._start_tick_flusher()
         self._start_maintenance()
 
     def __del__(self):
-        """Cleanup on destruction."""
+        """Cleanup on destruction, writing any ticks still queued."""
         self._stop_maintenance()
+        self._stop_tick_flusher()
+        if not self._shutdown_requested:
+            try:
+                self.flush_ticks()
+            except Exception as e:
+                self.logger.error(f"Failed to flush queued ticks on close: {e}")
         self._close_all_connections()
 
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections with automatic cleanup and error handling."""
+    def get_connection(self, readonly: bool = False):
+        """Context manager for database connections with automatic cleanup and error handling.
+
+        Pass ``readonly=True`` for queries; those connections come from the
+        reader pool and reject writes.  Writes are serialized on the single
+        writer connection.  A nested writer request on the thread that already
+        holds it reuses that connection while it has no open transaction;
+        inside an open transaction it fails at once, since the nested work
+        would commit or roll back the outer caller's partial writes.
+        """
+        if not readonly:
+            held = getattr(self._writer_owner, "conn", None)
+            if held is not None:
+                if held.in_transaction:
+                    raise sqlite3.OperationalError(
+                        "Writer connection has an open transaction on this thread"
+                    )
+                try:
+                    yield held
+                except Exception:
+                    if held.in_transaction:
+                        held.rollback()  # Only the nested caller's transaction
+                    raise
+                return
         conn = None
         try:
-            conn = self._get_connection_from_pool()
+            conn = self._get_connection_from_pool(readonly)
+            if not readonly:
+                self._writer_owner.conn = conn
             yield conn
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {e}")
@@ -98,7 +352,9 @@ class DatabaseManager:
             raise
         finally:
             if conn:
-                self._return_connection_to_pool(conn)
+                if not readonly:
+                    self._writer_owner.conn = None
+                self._return_connection_to_pool(conn, readonly)
 
     def store_probability_table(self, symbol: str, rows: List[ConditionalRow]) -> bool:
         """Store conditional probability table for a symbol."""
@@ -112,6 +368,7 @@ class DatabaseManager:
                 cursor.execute("DELETE FROM probability_tables WHERE symbol = ?", (symbol,))
                 
                 # Insert new probability data
+                created_at = _epoch_us()
                 insert_data = []
                 for row in rows:
                     insert_data.append((
@@ -123,7 +380,7 @@ class DatabaseManager:
                         row.succ,
                         row.tot,
                         row.p,
-                        datetime.now().isoformat()
+                        created_at
                     ))
                 
                 cursor.executemany("""
@@ -132,7 +389,11 @@ class DatabaseManager:
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, insert_data)
                 
+                self._refresh_probability_top(cursor, symbol)
                 conn.commit()
+                with self._symbols_lock:
+                    self._known_prob_symbols.add(symbol)
+                    self._prob_symbols_checked.pop(symbol, None)
                 
                 self.logger.info(f"Stored {len(rows)} probability rows for {symbol}")
                 self._update_query_stats(time.time() - start_time)
@@ -144,10 +405,12 @@ class DatabaseManager:
 
     def get_probability_table(self, symbol: str, min_samples: int = 200) -> List[ConditionalRow]:
         """Retrieve conditional probability table for a symbol."""
+        if not self._has_probability_table(symbol):
+            return []
         start_time = time.time()
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -157,18 +420,8 @@ class DatabaseManager:
                     ORDER BY probability DESC, total DESC
                 """, (symbol, min_samples))
                 
-                rows = []
-                for row in cursor.fetchall():
-                    conditional_row = ConditionalRow(
-                        trigger=row[0],
-                        outcome=row[1], 
-                        direction=row[2],
-                        state=row[3],
-                        succ=row[4],
-                        tot=row[5],
-                        p=row[6]
-                    )
-                    rows.append(conditional_row)
+                # Columns are selected in ConditionalRow field order
+                rows = list(starmap(ConditionalRow, cursor.fetchall()))
                 
                 self._update_query_stats(time.time() - start_time)
                 return rows
@@ -179,33 +432,35 @@ class DatabaseManager:
 
     def get_top_probabilities(self, symbol: str, limit: int = 200) -> List[ConditionalRow]:
         """Get top probability entries for a symbol (fast query)."""
+        if not self._has_probability_table(symbol):
+            return []
         start_time = time.time()
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
-                # Optimized query with index usage
-                cursor.execute("""
-                    SELECT trigger_type, outcome, direction, state, successes, total, probability
-                    FROM probability_tables 
-                    WHERE symbol = ?
-                    ORDER BY probability DESC, total DESC
-                    LIMIT ?
-                """, (symbol, limit))
+                if limit <= PROBABILITY_TOP_N:
+                    # Pre-ranked rows maintained by store_probability_table
+                    cursor.execute("""
+                        SELECT trigger_type, outcome, direction, state, successes, total, probability
+                        FROM probability_top
+                        WHERE symbol = ?
+                        ORDER BY rank
+                        LIMIT ?
+                    """, (symbol, limit))
+                else:
+                    # Optimized query with covering index usage
+                    cursor.execute("""
+                        SELECT trigger_type, outcome, direction, state, successes, total, probability
+                        FROM probability_tables 
+                        WHERE symbol = ?
+                        ORDER BY probability DESC, total DESC
+                        LIMIT ?
+                    """, (symbol, limit))
                 
-                rows = []
-                for row in cursor.fetchall():
-                    conditional_row = ConditionalRow(
-                        trigger=row[0],
-                        outcome=row[1],
-                        direction=row[2], 
-                        state=row[3],
-                        succ=row[4],
-                        tot=row[5],
-                        p=row[6]
-                    )
-                    rows.append(conditional_row)
+                # Columns are selected in ConditionalRow field order
+                rows = list(starmap(ConditionalRow, cursor.fetchall()))
                 
                 query_time = time.time() - start_time
                 self._update_query_stats(query_time)
@@ -220,20 +475,109 @@ class DatabaseManager:
             self.logger.error(f"Failed to get top probabilities for {symbol}: {e}")
             return []
 
+    def _has_probability_table(self, symbol: str) -> bool:
+        """Return whether *symbol* may have a stored probability table.
+
+        Known symbols answer from memory.  An unknown symbol is looked up in
+        the database once its last check is older than
+        PROBABILITY_SYMBOL_RECHECK_SECONDS, so tables stored by another
+        process are picked up.
+        """
+        if symbol in self._known_prob_symbols:
+            return True
+        now = time.monotonic()
+        checked = self._prob_symbols_checked.get(symbol, self._prob_symbols_loaded_at)
+        if now - checked < PROBABILITY_SYMBOL_RECHECK_SECONDS:
+            return False
+        
+        try:
+            with self.get_connection(readonly=True) as conn:
+                found = conn.execute(
+                    "SELECT EXISTS (SELECT 1 FROM probability_tables WHERE symbol = ?)", (symbol,)
+                ).fetchone()[0]
+        except Exception as e:
+            self.logger.error(f"Failed to look up probability table for {symbol}: {e}")
+            return False
+        
+        with self._symbols_lock:
+            checked_at = self._prob_symbols_checked
+            checked_at.pop(symbol, None)
+            if found:
+                self._known_prob_symbols.add(symbol)
+            else:
+                # Re-inserted last, so the first entry is the oldest check
+                checked_at[symbol] = now
+                if len(checked_at) > PROBABILITY_SYMBOL_CHECKS_MAX:
+                    del checked_at[next(iter(checked_at))]
+        return bool(found)
+
     def store_tick_data(self, symbol: str, bid: float, ask: float, timestamp: datetime = None) -> bool:
-        """Store tick data for historical analysis."""
+        """Queue tick data for historical analysis.
+
+        The tick is stamped immediately and written by the background flusher
+        in a batch with its neighbours; reads through this manager flush the
+        queue first, so a stored tick is always visible to the next query.
+        Returns False once the manager has been shut down; a batch that
+        later fails to commit is reported by flush_ticks().
+        """
+        if self._shutdown_requested:
+            return False
+        with self._tick_cond:
+            self._ticks_queued += 1
+            self._tick_queue.put((symbol, bid, ask, ask - bid, _epoch_us(timestamp), next(self._tick_seq)))
+        return True
+
+    def flush_ticks(self) -> bool:
+        """Write every tick queued so far and wait until the flusher has too.
+
+        Returns False if any queued tick failed to commit since the previous
+        call; those ticks are logged and dropped.  On a thread that holds the
+        writer connection the ticks stay queued for the flusher, which writes
+        them once the connection is released.
+        """
+        if getattr(self._writer_owner, "conn", None) is not None:
+            return True
+        with self._tick_cond:
+            target = self._ticks_queued
+        while True:
+            batch = self._drain_tick_queue(self.config.tick_flush_size)
+            if batch:
+                self._commit_tick_batch(batch)
+                continue
+            with self._tick_cond:
+                # Remaining ticks were taken by the flusher and are being written
+                settled = self._tick_cond.wait_for(
+                    lambda: self._ticks_written + self._ticks_failed >= target, timeout=1.0
+                )
+                if settled:
+                    failed = self._ticks_failed - self._ticks_failed_reported
+                    self._ticks_failed_reported = self._ticks_failed
+                    if failed:
+                        self.logger.error(f"{failed} queued ticks failed to commit")
+                    return not failed
+
+    def store_tick_data_batch(
+        self, symbol: str, ticks: Iterable[Tuple[float, float, Optional[datetime]]]
+    ) -> bool:
+        """Store many ``(bid, ask, timestamp)`` ticks for *symbol* in one transaction.
+
+        Ticks without a timestamp are stamped with the current time.  Ticks
+        sharing a timestamp are all kept.
+        """
+        seq = self._tick_seq
+        rows = [(symbol, bid, ask, ask - bid, _epoch_us(ts), next(seq)) for bid, ask, ts in ticks]
+        return self._write_tick_rows(rows, symbol)
+
+    def _write_tick_rows(self, rows: List[Tuple], symbol: str) -> bool:
+        """Insert prepared tick_data *rows* in a single transaction."""
         start_time = time.time()
         
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                tick_time = timestamp or datetime.now()
-                
-                cursor.execute("""
-                    INSERT INTO tick_data (symbol, bid, ask, spread, timestamp)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (symbol, bid, ask, ask - bid, tick_time.isoformat()))
+                cursor.execute("BEGIN IMMEDIATE")
+                for offset in range(0, len(rows), TICK_BATCH_SIZE):
+                    cursor.executemany(SQL_INSERT_TICK, rows[offset:offset + TICK_BATCH_SIZE])
                 
                 conn.commit()
                 self._update_query_stats(time.time() - start_time)
@@ -243,39 +587,51 @@ class DatabaseManager:
             self.logger.error(f"Failed to store tick data for {symbol}: {e}")
             return False
 
-    def get_historical_ticks(self, symbol: str, hours_back: int = 24, limit: int = 10000) -> List[Dict]:
-        """Retrieve historical tick data for analysis."""
+    def iter_historical_ticks(
+        self, symbol: str, hours_back: int = 24, limit: int = 10000
+    ) -> Iterator[sqlite3.Row]:
+        """Lazily yield recent ticks for *symbol*, newest first.
+
+        Rows are ``sqlite3.Row`` objects with ``bid``, ``ask``, ``spread`` and
+        ``timestamp`` (integer epoch microseconds) fields.  A reader connection
+        is held until the generator is exhausted or closed.
+        """
+        self.flush_ticks()
         start_time = time.time()
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.arraysize = 1000
                 
-                since_time = datetime.now() - timedelta(hours=hours_back)
+                since_time = _epoch_us(datetime.now() - timedelta(hours=hours_back))
                 
                 cursor.execute("""
                     SELECT bid, ask, spread, timestamp
                     FROM tick_data 
                     WHERE symbol = ? AND timestamp >= ?
-                    ORDER BY timestamp DESC
+                    ORDER BY timestamp DESC, seq DESC
                     LIMIT ?
-                """, (symbol, since_time.isoformat(), limit))
-                
-                ticks = []
-                for row in cursor.fetchall():
-                    ticks.append({
-                        'bid': row[0],
-                        'ask': row[1],
-                        'spread': row[2],
-                        'timestamp': row[3]
-                    })
+                """, (symbol, since_time, limit))
                 
+                yield from cursor
                 self._update_query_stats(time.time() - start_time)
-                return ticks
                 
         except Exception as e:
             self.logger.error(f"Failed to get historical ticks for {symbol}: {e}")
-            return []
+
+    def get_historical_ticks(self, symbol: str, hours_back: int = 24, limit: int = 10000) -> List[Dict]:
+        """Retrieve historical tick data for analysis."""
+        return [
+            {
+                'bid': row['bid'],
+                'ask': row['ask'],
+                'spread': row['spread'],
+                'timestamp': _iso_from_us(row['timestamp'])
+            }
+            for row in self.iter_historical_ticks(symbol, hours_back, limit)
+        ]
 
     def store_system_config(self, config_name: str, config_data: Dict) -> bool:
         """Store system configuration."""
@@ -288,7 +644,7 @@ class DatabaseManager:
                 cursor.execute("""
                     INSERT OR REPLACE INTO system_config (name, config_data, updated_at)
                     VALUES (?, ?, ?)
-                """, (config_name, json.dumps(config_data), datetime.now().isoformat()))
+                """, (config_name, _json_dumps(config_data), _epoch_us()))
                 
                 conn.commit()
                 self._update_query_stats(time.time() - start_time)
@@ -303,7 +659,7 @@ class DatabaseManager:
         start_time = time.time()
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -314,7 +670,7 @@ class DatabaseManager:
                 self._update_query_stats(time.time() - start_time)
                 
                 if row:
-                    return json.loads(row[0])
+                    return _json_loads(row[0])
                 return None
                 
         except Exception as e:
@@ -335,8 +691,8 @@ class DatabaseManager:
                 """, (
                     metric_name, 
                     value, 
-                    json.dumps(context or {}), 
-                    datetime.now().isoformat()
+                    _json_dumps(context or {}), 
+                    _epoch_us()
                 ))
                 
                 conn.commit()
@@ -347,38 +703,51 @@ class DatabaseManager:
             self.logger.error(f"Failed to log performance metric {metric_name}: {e}")
             return False
 
-    def get_performance_metrics(self, metric_name: str = None, hours_back: int = 24) -> List[Dict]:
-        """Retrieve performance metrics for analysis."""
+    def get_performance_metrics(
+        self, metric_name: str = None, hours_back: int = 24, context_filter: Dict = None
+    ) -> List[Dict]:
+        """Retrieve performance metrics for analysis.
+
+        *context_filter* maps context keys to required values; matching is done
+        in SQLite so non-matching rows are never decoded.  Contexts holding NaN
+        or infinities are returned unfiltered but never match a filter, since
+        SQLite's JSON functions cannot parse them.
+        """
         start_time = time.time()
         
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
-                since_time = datetime.now() - timedelta(hours=hours_back)
+                since_time = _epoch_us(datetime.now() - timedelta(hours=hours_back))
                 
+                clauses = ["timestamp >= ?"]
+                params: List[Any] = [since_time]
                 if metric_name:
-                    cursor.execute("""
-                        SELECT metric_name, value, context, timestamp
-                        FROM performance_log 
-                        WHERE metric_name = ? AND timestamp >= ?
-                        ORDER BY timestamp DESC
-                    """, (metric_name, since_time.isoformat()))
-                else:
-                    cursor.execute("""
-                        SELECT metric_name, value, context, timestamp
-                        FROM performance_log 
-                        WHERE timestamp >= ?
-                        ORDER BY timestamp DESC
-                    """, (since_time.isoformat(),))
+                    clauses.insert(0, "metric_name = ?")
+                    params.insert(0, metric_name)
+                for key, value in (context_filter or {}).items():
+                    if key == "symbol":
+                        clauses.append("ctx_symbol = ?")  # Indexed generated column
+                    else:
+                        clauses.append("json_valid(context) AND json_extract(context, ?) = ?")
+                        params.append('$."{}"'.format(key.replace('"', '\\"')))
+                    params.append(value)
+                
+                cursor.execute(f"""
+                    SELECT metric_name, value, context, timestamp
+                    FROM performance_log 
+                    WHERE {' AND '.join(clauses)}
+                    ORDER BY timestamp DESC
+                """, params)
                 
                 metrics = []
                 for row in cursor.fetchall():
                     metrics.append({
                         'metric_name': row[0],
                         'value': row[1],
-                        'context': json.loads(row[2]) if row[2] else {},
-                        'timestamp': row[3]
+                        'context': _json_loads(row[2]) if row[2] else {},
+                        'timestamp': _iso_from_us(row[3])
                     })
                 
                 self._update_query_stats(time.time() - start_time)
@@ -390,9 +759,10 @@ class DatabaseManager:
 
     def get_database_stats(self) -> Dict:
         """Get database statistics and health metrics."""
+        self.flush_ticks()
         stats = {
-            'connection_pool_size': len(self._connection_pool),
-            'query_stats': self._query_stats.copy(),
+            'connection_pool_size': len(self._writer_pool) + len(self._reader_pool),
+            'query_stats': self._query_stats(),
             'db_size_mb': 0,
             'table_counts': {},
             'last_maintenance': None
@@ -402,7 +772,7 @@ class DatabaseManager:
             if self.db_path.exists():
                 stats['db_size_mb'] = self.db_path.stat().st_size / (1024 * 1024)
             
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = conn.cursor()
                 
                 # Get table counts
@@ -418,23 +788,27 @@ class DatabaseManager:
 
     def cleanup_old_data(self) -> bool:
         """Clean up old data based on retention policies."""
+        self.flush_ticks()
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
                 
                 # Clean old probability tables
                 prob_cutoff = datetime.now() - timedelta(days=self.config.probability_table_retention_days)
-                cursor.execute("DELETE FROM probability_tables WHERE created_at < ?", (prob_cutoff.isoformat(),))
+                cursor.execute("DELETE FROM probability_tables WHERE created_at < ?", (_epoch_us(prob_cutoff),))
                 prob_deleted = cursor.rowcount
+                if prob_deleted:
+                    self._refresh_probability_top(cursor)
                 
                 # Clean old tick data
                 tick_cutoff = datetime.now() - timedelta(days=self.config.tick_data_retention_days)
-                cursor.execute("DELETE FROM tick_data WHERE timestamp < ?", (tick_cutoff.isoformat(),))
+                cursor.execute("DELETE FROM tick_data WHERE timestamp < ?", (_epoch_us(tick_cutoff),))
                 tick_deleted = cursor.rowcount
                 
                 # Clean old performance logs
                 log_cutoff = datetime.now() - timedelta(days=self.config.log_retention_days)
-                cursor.execute("DELETE FROM performance_log WHERE timestamp < ?", (log_cutoff.isoformat(),))
+                cursor.execute("DELETE FROM performance_log WHERE timestamp < ?", (_epoch_us(log_cutoff),))
                 log_deleted = cursor.rowcount
                 
                 conn.commit()
@@ -446,182 +820,327 @@ class DatabaseManager:
             self.logger.error(f"Failed to cleanup old data: {e}")
             return False
 
+    def _refresh_probability_top(self, cursor: sqlite3.Cursor, symbol: Optional[str] = None):
+        """Rebuild the materialized top-N rows for *symbol*, or for every symbol."""
+        where, params = ("WHERE symbol = ?", (symbol,)) if symbol is not None else ("", ())
+        cursor.execute(f"DELETE FROM probability_top {where}", params)
+        cursor.execute(f"""
+            INSERT INTO probability_top
+            (symbol, rank, trigger_type, outcome, direction, state, successes, total, probability)
+            SELECT symbol, rank, trigger_type, outcome, direction, state, successes, total, probability
+            FROM (
+                SELECT *, row_number() OVER (
+                    PARTITION BY symbol ORDER BY probability DESC, total DESC
+                ) - 1 AS rank
+                FROM probability_tables {where}
+            )
+            WHERE rank < ?
+        """, params + (PROBABILITY_TOP_N,))
+
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """Rebuild legacy tables whose layout differs from ``TABLE_DDL``."""
+        cursor = conn.cursor()
+        for table, ddl in TABLE_DDL.items():
+            columns = {row[1]: row[2].upper() for row in cursor.execute(f"PRAGMA table_info({table})")}
+            if not columns:
+                continue
+            sql = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            time_column = TIME_COLUMNS.get(table)
+            legacy_key = table == "tick_data" and "seq" not in columns
+            legacy_time = time_column is not None and columns.get(time_column) == "TEXT"
+            legacy_sequence = "AUTOINCREMENT" in sql.upper()
+            if legacy_key or legacy_time or legacy_sequence:
+                self._rebuild_table(conn, table, ddl, set(columns))
+
+        # Rebuilt tables no longer use AUTOINCREMENT; forget their sequences
+        if cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'").fetchone():
+            cursor.execute("DELETE FROM sqlite_sequence")
+
+        # Generated context columns; table_info hides them, table_xinfo does not.
+        # A table with an unguarded ctx_symbol is rebuilt; its index is
+        # recreated with the others.
+        columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(performance_log)")}
+        if "ctx_symbol" in columns:
+            sql = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'performance_log'"
+            ).fetchone()[0]
+            if "json_valid" not in sql:
+                stored = {row[1] for row in cursor.execute("PRAGMA table_info(performance_log)")}
+                self._rebuild_table(conn, "performance_log", PERFORMANCE_LOG_DDL, stored)
+        elif columns:
+            cursor.execute(
+                "ALTER TABLE performance_log ADD COLUMN ctx_symbol TEXT "
+                f"GENERATED ALWAYS AS ({CTX_SYMBOL_EXPR}) VIRTUAL"
+            )
+
+    def _rebuild_table(self, conn: sqlite3.Connection, table: str, ddl: str, old_columns: set):
+        """Copy *table* into the layout described by *ddl*, converting ISO times.
+
+        A legacy tick_data ``id`` becomes the tick's ``seq``.
+        """
+        self.logger.info(f"Migrating {table} to current schema")
+        conn.create_function("iso_to_us", 1, _iso_to_us, deterministic=True)
+        cursor = conn.cursor()
+        staging = f"{table}_migrated"
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(ddl.format(table=staging))
+        new_columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({staging})")]
+        columns = [column for column in new_columns if column in old_columns]
+        select = [
+            f"iso_to_us({column})" if column == TIME_COLUMNS.get(table) else column
+            for column in columns
+        ]
+        if table == "tick_data" and "seq" not in old_columns and "id" in old_columns:
+            columns.append("seq")
+            select.append("id")
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO {staging} ({", ".join(columns)})
+            SELECT {", ".join(select)} FROM {table}
+        """)
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+
+    def _configure_database(self):
+        """Apply database-wide PRAGMAs once using a short-lived setup connection."""
+        conn = sqlite3.connect(self.db_path, timeout=self.config.connection_timeout)
+        try:
+            # page_size only takes effect before the first table exists and
+            # must precede the switch to WAL
+            conn.execute("PRAGMA page_size=8192")
+            conn.execute("PRAGMA journal_mode=WAL")  # Persistent, WAL for better concurrency
+        finally:
+            conn.close()
+
     def _initialize_database(self):
         """Initialize database schema with optimized indexes."""
+        self._configure_database()
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Probability tables
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS probability_tables (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        symbol TEXT NOT NULL,
-                        trigger_type TEXT NOT NULL,
-                        outcome TEXT NOT NULL,
-                        direction TEXT NOT NULL,
-                        state TEXT NOT NULL,
-                        successes INTEGER NOT NULL,
-                        total INTEGER NOT NULL,
-                        probability REAL NOT NULL,
-                        created_at TEXT NOT NULL
-                    )
-                """)
-                
-                # Tick data table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS tick_data (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        symbol TEXT NOT NULL,
-                        bid REAL NOT NULL,
-                        ask REAL NOT NULL,
-                        spread REAL NOT NULL,
-                        timestamp TEXT NOT NULL
-                    )
-                """)
-                
-                # System configuration
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS system_config (
-                        name TEXT PRIMARY KEY,
-                        config_data TEXT NOT NULL,
-                        updated_at TEXT NOT NULL
-                    )
-                """)
-                
-                # Performance logging
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS performance_log (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        metric_name TEXT NOT NULL,
-                        value REAL NOT NULL,
-                        context TEXT,
-                        timestamp TEXT NOT NULL
-                    )
-                """)
+                # Bring tables from older releases up to date, then create
+                # anything missing
+                self._migrate_schema(conn)
+                for table, ddl in TABLE_DDL.items():
+                    cursor.execute(ddl.format(table=table))
                 
                 # Create optimized indexes for fast queries
+                # Superseded by the covering probability index below
+                cursor.execute("DROP INDEX IF EXISTS idx_prob_symbol_prob")
+                cursor.execute("DROP INDEX IF EXISTS idx_prob_symbol_total")
+                
                 indexes = [
-                    "CREATE INDEX IF NOT EXISTS idx_prob_symbol_prob ON probability_tables (symbol, probability DESC)",
-                    "CREATE INDEX IF NOT EXISTS idx_prob_symbol_total ON probability_tables (symbol, total DESC)", 
-                    "CREATE INDEX IF NOT EXISTS idx_tick_symbol_time ON tick_data (symbol, timestamp)",
-                    "CREATE INDEX IF NOT EXISTS idx_perf_metric_time ON performance_log (metric_name, timestamp)"
+                    # Covers the probability table/top-N queries so they are
+                    # answered from the index without touching table rows
+                    """CREATE INDEX IF NOT EXISTS idx_prob_cover ON probability_tables
+                       (symbol, probability DESC, total DESC, trigger_type, outcome, direction, state, successes)""",
+                    "CREATE INDEX IF NOT EXISTS idx_perf_metric_time ON performance_log (metric_name, timestamp)",
+                    "CREATE INDEX IF NOT EXISTS idx_perf_ctx_symbol ON performance_log (ctx_symbol, timestamp)",
+                    # Retention cutoffs, so cleanup range-scans only expired rows
+                    "CREATE INDEX IF NOT EXISTS idx_prob_created ON probability_tables (created_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_tick_time ON tick_data (timestamp)",
+                    "CREATE INDEX IF NOT EXISTS idx_perf_time ON performance_log (timestamp)"
                 ]
                 
                 for index_sql in indexes:
                     cursor.execute(index_sql)
                 
+                # Backfill the top-N table for databases created before it existed
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM probability_top)")
+                if not cursor.fetchone()[0]:
+                    self._refresh_probability_top(cursor)
+                
                 conn.commit()
+                cursor.execute("SELECT DISTINCT symbol FROM probability_tables")
+                with self._symbols_lock:
+                    self._known_prob_symbols.update(row[0] for row in cursor.fetchall())
+                    self._prob_symbols_loaded_at = time.monotonic()
                 self.logger.info("Database schema initialized successfully")
                 
         except Exception as e:
             self.logger.error(f"Failed to initialize database: {e}")
             raise
 
-    def _get_connection_from_pool(self) -> sqlite3.Connection:
-        """Get connection from pool or create new one with proper concurrency controls."""
-        with self._pool_lock:
-            if self._connection_pool:
-                conn = self._connection_pool.pop()
-                # Track active connection
-                self._active_connections[id(conn)] = conn
-                return conn
+    def _get_connection_from_pool(self, readonly: bool = False) -> sqlite3.Connection:
+        """Get a reader or writer connection, waiting for a free slot in that pool."""
+        slots, pool = self._pool_for(readonly)
+        if not slots.acquire(timeout=self.config.connection_timeout):
+            kind = "reader" if readonly else "writer"
+            raise sqlite3.OperationalError(f"Timed out waiting for a {kind} connection")
+        
+        try:
+            conn = pool.pop()
+        except IndexError:
+            try:
+                conn = self._open_connection(readonly)
+            except BaseException:
+                slots.release()
+                raise
         
-        # Create new connection with better locking strategy
+        # Track active connection
+        self._active_connections[id(conn)] = conn
+        return conn
+
+    def _open_connection(self, readonly: bool) -> sqlite3.Connection:
+        """Open a new connection configured for the reader or writer pool."""
+        # Writers delimit their own transactions and commit() once, so a
+        # batch of statements shares a single fsync
+        # sqlite3 keeps an LRU of prepared statements keyed by SQL text; every
+        # query here uses constant SQL, so pooled connections re-bind instead
+        # of re-compiling
         conn = sqlite3.connect(
             self.db_path,
             timeout=self.config.connection_timeout,
             check_same_thread=False,
-            isolation_level=None  # Autocommit mode to prevent locks
+            cached_statements=self.config.statement_cache_size,
         )
         
-        # Configure connection for better concurrency and performance
-        conn.execute("PRAGMA journal_mode=WAL")  # WAL mode for better concurrency
-        conn.execute("PRAGMA synchronous=NORMAL")  # Balance safety and speed
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
-        conn.execute("PRAGMA busy_timeout=30000")  # 30 second timeout for locks
-        conn.execute("PRAGMA locking_mode=NORMAL")  # Allow concurrent access
-        
-        # Track active connection
-        self._active_connections[id(conn)] = conn
+        # Connection-scoped settings; database-wide ones are applied once in
+        # _configure_database
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if readonly:
+            conn.execute("PRAGMA query_only = 1")
         return conn
 
-    def _return_connection_to_pool(self, conn: sqlite3.Connection):
-        """Return connection to pool with proper cleanup."""
-        with self._pool_lock:
+    def _pool_for(self, readonly: bool) -> Tuple[threading.Semaphore, deque]:
+        """Return the slot semaphore and idle-connection deque for a pool."""
+        if readonly:
+            return self._reader_slots, self._reader_pool
+        return self._writer_slots, self._writer_pool
+
+    def _return_connection_to_pool(self, conn: sqlite3.Connection, readonly: bool = False):
+        """Return connection to its pool with proper cleanup."""
+        slots, pool = self._pool_for(readonly)
+        try:
             # Remove from active connections
-            conn_id = id(conn)
-            if conn_id in self._active_connections:
-                del self._active_connections[conn_id]
+            self._active_connections.pop(id(conn), None)
             
-            # Ensure connection is not in a transaction
-            try:
-                conn.rollback()  # Clear any pending transaction
-            except sqlite3.Error:
-                pass
+            # Readers never open a transaction; writers may have left one open
+            if not readonly and conn.in_transaction:
+                try:
+                    conn.rollback()  # Clear any pending transaction
+                except sqlite3.Error:
+                    pass
             
-            if len(self._connection_pool) < self.config.max_connections and not self._shutdown_requested:
-                self._connection_pool.append(conn)
-            else:
+            if self._shutdown_requested:
                 try:
                     conn.close()
                 except sqlite3.Error:
                     pass
+            else:
+                pool.append(conn)
+        finally:
+            slots.release()
 
     def _close_all_connections(self):
         """Close all pooled and active connections."""
         self._shutdown_requested = True
-        with self._pool_lock:
-            # Close pooled connections
-            for conn in self._connection_pool:
+        # Close pooled connections, then any remaining active connections
+        for pool in (self._writer_pool, self._reader_pool):
+            while pool:
                 try:
-                    conn.close()
-                except sqlite3.Error:
+                    pool.pop().close()
+                except (IndexError, sqlite3.Error):
                     pass
-            self._connection_pool.clear()
-            
-            # Close any remaining active connections
-            for conn in self._active_connections.values():
-                try:
-                    conn.close()
-                except sqlite3.Error:
-                    pass
-            self._active_connections.clear()
+        
+        for conn in list(self._active_connections.values()):
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._active_connections.clear()
 
     def shutdown(self):
         """Public method to gracefully shutdown the database manager."""
         self.logger.info("Shutting down database manager...")
         self._stop_maintenance()
+        self._stop_tick_flusher()
+        self.flush_ticks()
+        self._optimize_database()
         self._close_all_connections()
         self.logger.info("Database manager shutdown complete")
 
     def _update_query_stats(self, query_time: float):
         """Update query performance statistics."""
-        self._query_stats['total_queries'] += 1
-        self._query_stats['last_query_time'] = datetime.now()
-        
-        # Update rolling average
-        if self._query_stats['avg_query_time_ms'] == 0:
-            self._query_stats['avg_query_time_ms'] = query_time * 1000
-        else:
-            self._query_stats['avg_query_time_ms'] = (
-                self._query_stats['avg_query_time_ms'] * 0.9 + (query_time * 1000) * 0.1
-            )
-        
-        # Track slow queries
-        if query_time * 1000 > self.config.performance_target_ms:
-            self._query_stats['slow_queries'] += 1
+        micros = int(query_time * 1_000_000)
+        slow = micros > self.config.performance_target_ms * 1000
+        with self._stats_lock:
+            counters = self._query_counters
+            counters[0] += 1
+            counters[1] += micros
+            counters[2] += slow
+            self._last_query_time = datetime.now()
+
+    def _query_stats(self) -> Dict:
+        """Snapshot query counters, deriving the mean query time."""
+        with self._stats_lock:
+            total, micros, slow = self._query_counters
+            last = self._last_query_time
+        return {
+            'total_queries': total,
+            'avg_query_time_ms': micros / total / 1000 if total else 0.0,
+            'slow_queries': slow,
+            'last_query_time': last
+        }
+
+    def _start_tick_flusher(self):
+        """Start the background thread that batches queued ticks into the database."""
+        self._tick_flusher_stop.clear()
+        self._tick_flusher = threading.Thread(target=self._tick_flush_loop, daemon=True)
+        self._tick_flusher.start()
+
+    def _stop_tick_flusher(self):
+        """Stop the tick flusher; ticks still queued are left for flush_ticks()."""
+        self._tick_flusher_stop.set()
+        if self._tick_flusher:
+            self._tick_flusher.join(timeout=5)
+
+    def _tick_flush_loop(self):
+        """Write queued ticks every tick_flush_interval_ms, tick_flush_size at a time."""
+        interval = self.config.tick_flush_interval_ms / 1000.0
+        while not self._tick_flusher_stop.wait(interval):
+            batch = self._drain_tick_queue(self.config.tick_flush_size)
+            while batch:
+                self._commit_tick_batch(batch)
+                batch = self._drain_tick_queue(self.config.tick_flush_size)
+
+    def _drain_tick_queue(self, max_items: int) -> List[Tuple]:
+        """Take up to *max_items* queued ticks without blocking."""
+        batch = []
+        while len(batch) < max_items:
+            try:
+                batch.append(self._tick_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _commit_tick_batch(self, batch: List[Tuple]):
+        """Write a batch of queued tick rows and account for them as written or failed."""
+        committed = False
+        try:
+            committed = self._write_tick_rows(batch, "queued ticks")
+        finally:
+            with self._tick_cond:
+                if committed:
+                    self._ticks_written += len(batch)
+                else:
+                    self._ticks_failed += len(batch)
+                self._tick_cond.notify_all()
 
     def _start_maintenance(self):
         """Start background maintenance thread."""
         self._maintenance_active = True
+        self._maintenance_wake.clear()
         self._maintenance_thread = threading.Thread(target=self._maintenance_loop, daemon=True)
         self._maintenance_thread.start()
 
     def _stop_maintenance(self):
         """Stop background maintenance."""
         self._maintenance_active = False
+        self._maintenance_wake.set()
         if self._maintenance_thread:
             self._maintenance_thread.join(timeout=5)
 
@@ -629,6 +1148,7 @@ class DatabaseManager:
         """Background maintenance tasks."""
         last_vacuum = datetime.now()
         last_backup = datetime.now()
+        last_optimize = datetime.now()
         
         while self._maintenance_active:
             try:
@@ -644,11 +1164,24 @@ class DatabaseManager:
                     self.cleanup_old_data()
                     last_backup = now
                 
-                time.sleep(3600)  # Check hourly
+                # Refresh planner statistics after bulk ingests
+                if now - last_optimize > timedelta(hours=self.config.optimize_interval_hours):
+                    self._optimize_database()
+                    last_optimize = now
+                
+                self._maintenance_wake.wait(3600)  # Check hourly
                 
             except Exception as e:
                 self.logger.error(f"Maintenance loop error: {e}")
-                time.sleep(3600)
+                self._maintenance_wake.wait(3600)
+
+    def _optimize_database(self):
+        """Let SQLite refresh query planner statistics where they are stale."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute("PRAGMA optimize")
+        except Exception as e:
+            self.logger.error(f"Database optimize failed: {e}")
 
     def _vacuum_database(self):
         """Vacuum database to reclaim space and optimize."""
@@ -658,4 +1191,4 @@ class DatabaseManager:
                 conn.execute("ANALYZE") 
             self.logger.info("Database vacuum and analyze completed")
         except Exception as e:
-            self.logger.error(f"Database vacuum failed: {e}")
\ No newline at end of file
+            self.logger.error(f"Database vacuum failed: {e}")
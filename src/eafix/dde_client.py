@@ -12,14 +12,19 @@ with MetaTrader platforms, including:
 from __future__ import annotations
 
 import logging
+import sys
 import threading
 import time
-from collections import deque
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Callable, Deque
+from typing import Dict, List, Optional, Callable, Tuple
 from enum import Enum
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain
+# dataclasses with an instance __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class DDEConnectionState(Enum):
     """DDE connection states."""
@@ -30,7 +35,7 @@ class DDEConnectionState(Enum):
     RECONNECTING = "RECONNECTING"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TickData:
     """Individual tick data point."""
     symbol: str
@@ -46,6 +51,144 @@ class TickData:
         return (self.bid + self.ask) / 2.0
 
 
+def _datetime_to_ns(moment: datetime) -> int:
+    """Return a naive local *moment* as integer nanoseconds since the epoch."""
+    return (int(moment.timestamp()) * 1_000_000 + moment.microsecond) * 1000
+
+
+def _now_ns() -> int:
+    """Current time as epoch nanoseconds at the microsecond resolution of ``datetime``."""
+    return time.time_ns() // 1000 * 1000
+
+
+def _ns_to_datetime(value: int) -> datetime:
+    """Inverse of :func:`_datetime_to_ns`."""
+    seconds, nanos = divmod(value, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=nanos // 1000)
+
+
+def _parse_server_time(text: str) -> datetime:
+    """Parse an MT4 ``YYYY.MM.DD HH:MM:SS`` TIME value.
+
+    The topic is fixed-width, so fields are sliced out directly; anything
+    else goes through ``strptime``.  Raises ``ValueError`` on bad input.
+    """
+    if len(text) == 19 and text[4] == text[7] == "." and text[10] == " " and text[13] == text[16] == ":":
+        return datetime(
+            int(text[0:4]), int(text[5:7]), int(text[8:10]),
+            int(text[11:13]), int(text[14:16]), int(text[17:19])
+        )
+    return datetime.strptime(text, "%Y.%m.%d %H:%M:%S")
+
+
+class _TickRing:
+    """Fixed-capacity tick buffer for one symbol, stored column-wise.
+
+    Prices and times live in preallocated ``array`` columns written in place,
+    so buffering a tick allocates nothing; :class:`TickData` objects are only
+    built for the ticks a caller asks for.
+
+    The ring is single-producer: :class:`DDEClient` serializes every
+    :meth:`append` under its producer lock, and an append fills a slot before
+    publishing it by advancing ``head``.  Readers take no lock; they snapshot ``head``, read the slots
+    behind it and drop any the writer lapped meanwhile.  Storage is rounded
+    up to a power of two so slots are addressed with a mask, and the spare
+    slots give readers slack before a lap.
+    """
+
+    __slots__ = ("symbol", "capacity", "mask", "bid", "ask", "ts_ns", "server_time", "head", "dispatched")
+
+    def __init__(self, symbol: str, capacity: int):
+        self.symbol = symbol
+        self.capacity = max(1, capacity)
+        # At least one spare slot, so the slot being written is never one a
+        # reader of the newest ``capacity`` ticks needs
+        storage = 1 << self.capacity.bit_length()
+        self.mask = storage - 1
+        self.bid = array("d", bytes(8 * storage))
+        self.ask = array("d", bytes(8 * storage))
+        self.ts_ns = array("q", bytes(8 * storage))
+        self.server_time: List[Optional[datetime]] = [None] * storage
+        self.head = 0  # Ticks published so far; the next slot is head & mask
+        self.dispatched = 0  # Ticks already handed to bulk callbacks
+
+    def __len__(self) -> int:
+        return min(self.head, self.capacity)
+
+    def append(self, bid: float, ask: float, ts_ns: int, server_time: Optional[datetime] = None):
+        head = self.head
+        i = head & self.mask
+        self.bid[i] = bid
+        self.ask[i] = ask
+        self.ts_ns[i] = ts_ns
+        self.server_time[i] = server_time
+        self.head = head + 1  # Publish the slot
+
+    def _tick_at(self, i: int) -> TickData:
+        bid, ask = self.bid[i], self.ask[i]
+        return TickData(
+            symbol=self.symbol,
+            bid=bid,
+            ask=ask,
+            spread=ask - bid,
+            timestamp=_ns_to_datetime(self.ts_ns[i]),
+            server_time=self.server_time[i]
+        )
+
+    def _slots(self, count: int) -> range:
+        """Sequence numbers of the newest *count* published ticks, oldest first."""
+        head = self.head
+        count = max(0, min(count, head, self.capacity))
+        return range(head - count, head)
+
+    def _unlapped(self, slots: range) -> int:
+        """Number of leading *slots* the writer may have overwritten while they were read."""
+        # The slot of the tick being written next (head) may already be torn
+        oldest_intact = self.head - self.mask
+        return max(0, min(len(slots), oldest_intact - slots.start))
+
+    def latest(self) -> Optional[TickData]:
+        history = self.tail(1)
+        return history[0] if history else None
+
+    def tail(self, count: int) -> List[TickData]:
+        slots = self._slots(count)
+        mask = self.mask
+        ticks = [self._tick_at(n & mask) for n in slots]
+        return ticks[self._unlapped(slots):]
+
+    def columns(self, count: int) -> Dict[str, array]:
+        """Copy the newest *count* ticks into ``bid``/``ask``/``ts_ns`` arrays."""
+        slots = self._slots(count)
+        start, stop = slots.start & self.mask, slots.stop & self.mask
+        result = {}
+        for name in ("bid", "ask", "ts_ns"):
+            column = getattr(self, name)
+            if not slots:
+                result[name] = column[:0]
+            elif start < stop:
+                result[name] = column[start:stop]
+            else:
+                # Newest ticks wrap around the end of the ring
+                result[name] = column[start:] + column[:stop]
+        skip = self._unlapped(slots)
+        if skip:
+            result = {name: column[skip:] for name, column in result.items()}
+        return result
+
+
+# Receives ``(symbol, {"bid": ..., "ask": ..., "ts_ns": ...})`` tick batches
+BulkTickCallback = Callable[[str, Dict[str, array]], None]
+
+
+def _without(callbacks: tuple, callback) -> tuple:
+    """Return *callbacks* minus the first occurrence of *callback*."""
+    if callback not in callbacks:
+        return callbacks
+    index = callbacks.index(callback)
+    return callbacks[:index] + callbacks[index + 1:]
+
+
 @dataclass
 class DDEConfig:
     """DDE client configuration."""
@@ -54,6 +197,7 @@ class DDEConfig:
     reconnect_sec: int = 5
     reconnect_attempts: int = 10
     buffer_size: int = 1000
+    bulk_batch_size: int = 32  # Ticks per symbol handed to bulk callbacks at once
     
     # DDE specific settings
     server_name: str = "MT4"
@@ -78,24 +222,34 @@ class DDEClient:
         self.connection_handle = None
         self._connected_topics = set()
         
-        # Thread-safe tick buffers
-        self._buffers: Dict[str, Deque[TickData]] = {}
+        # Last polled raw (bid, ask) strings per symbol; unchanged quotes are
+        # not re-emitted
+        self._last_quotes: Dict[str, Tuple[str, str]] = {}
+        
+        # Per-symbol tick rings; readers are lock-free, the buffer lock only
+        # serializes adding and removing rings.  Ticks arrive from the polling
+        # thread and from push_tick() callers, so writers share the producer
+        # lock to keep each ring single-producer.
+        self._buffers: Dict[str, _TickRing] = {}
         self._buffer_lock = threading.RLock()
+        self._producer_lock = threading.RLock()
         
         # Background polling
         self._polling_active = False
         self._polling_thread: Optional[threading.Thread] = None
         
-        # Callbacks for real-time data
-        self._tick_callbacks: List[Callable[[TickData], None]] = []
+        # Callbacks for real-time data; tuples replaced on change, so the tick
+        # path iterates a snapshot without locking
+        self._tick_callbacks: Tuple[Callable[[TickData], None], ...] = ()
+        self._bulk_callbacks: Tuple[BulkTickCallback, ...] = ()
         
-        # Statistics
+        # Statistics; tick counts and active symbols are derived from the
+        # rings' head indices when status is requested
         self._stats = {
-            'ticks_received': 0,
-            'connection_failures': 0,
-            'last_tick_time': None,
-            'symbols_active': set()
+            'connection_failures': 0
         }
+        self._last_tick_ns: Optional[int] = None
+        self._ticks_retired = 0  # Ticks buffered by rings since unsubscribed
 
     def connect(self) -> bool:
         """Establish DDE connection to MetaTrader."""
@@ -179,6 +333,7 @@ class DDEClient:
         
         self.state = DDEConnectionState.DISCONNECTED
         self._connected_topics.clear()
+        self._last_quotes.clear()
         
         self.logger.info("DDE client disconnected")
 
@@ -190,7 +345,7 @@ class DDEClient:
         # Initialize buffer for symbol
         with self._buffer_lock:
             if symbol not in self._buffers:
-                self._buffers[symbol] = deque(maxlen=self.config.buffer_size)
+                self._buffers[symbol] = _TickRing(symbol, self.config.buffer_size)
         
         # If connected, subscribe to DDE topics
         if self.state == DDEConnectionState.CONNECTED:
@@ -202,38 +357,69 @@ class DDEClient:
         """Unsubscribe from symbol data."""
         if symbol in self.config.symbols:
             self.config.symbols.remove(symbol)
+        # A later re-subscribe must emit its first quote even if unchanged
+        self._last_quotes.pop(symbol, None)
         
         with self._buffer_lock:
-            if symbol in self._buffers:
-                del self._buffers[symbol]
-        
-        # Remove from active stats
-        self._stats['symbols_active'].discard(symbol)
+            buffer = self._buffers.pop(symbol, None)
+            if buffer is not None:
+                self._ticks_retired += buffer.head
         
         return True
 
     def get_latest_tick(self, symbol: str) -> Optional[TickData]:
         """Get the most recent tick for a symbol."""
-        with self._buffer_lock:
-            buffer = self._buffers.get(symbol)
-            if buffer and len(buffer) > 0:
-                return buffer[-1]
-        return None
+        buffer = self._buffers.get(symbol)
+        return buffer.latest() if buffer is not None else None
 
     def get_tick_history(self, symbol: str, count: int = 100) -> List[TickData]:
         """Get recent tick history for a symbol."""
-        with self._buffer_lock:
-            buffer = self._buffers.get(symbol, deque())
-            return list(buffer)[-count:]
+        buffer = self._buffers.get(symbol)
+        return buffer.tail(count) if buffer is not None else []
+
+    def get_tick_columns(self, symbol: str, count: int = 100) -> Dict[str, array]:
+        """Get recent ``bid``/``ask``/``ts_ns`` columns for a symbol, oldest first.
+
+        Cheaper than :meth:`get_tick_history` for numeric consumers because no
+        per-tick objects are created.
+        """
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = _TickRing(symbol, 1)
+        return buffer.columns(count)
 
     def add_tick_callback(self, callback: Callable[[TickData], None]):
         """Add callback for real-time tick updates."""
-        self._tick_callbacks.append(callback)
+        self._tick_callbacks = (*self._tick_callbacks, callback)
 
     def remove_tick_callback(self, callback: Callable[[TickData], None]):
         """Remove tick update callback."""
-        if callback in self._tick_callbacks:
-            self._tick_callbacks.remove(callback)
+        self._tick_callbacks = _without(self._tick_callbacks, callback)
+
+    def add_bulk_tick_callback(self, callback: BulkTickCallback):
+        """Add a callback receiving ticks in batches as ``(symbol, columns)``.
+
+        ``columns`` holds ``bid``/``ask``/``ts_ns`` arrays of up to
+        ``bulk_batch_size`` ticks, oldest first.  Batches are delivered on the
+        thread producing ticks, when a symbol has a full batch and at the end
+        of every polling cycle.
+        """
+        self._bulk_callbacks = (*self._bulk_callbacks, callback)
+
+    def remove_bulk_tick_callback(self, callback: BulkTickCallback):
+        """Remove a bulk tick callback."""
+        self._bulk_callbacks = _without(self._bulk_callbacks, callback)
+
+    def flush_bulk_callbacks(self):
+        """Deliver every pending partial batch to the bulk callbacks.
+
+        The polling thread does this itself after each cycle.
+        """
+        if self._bulk_callbacks:
+            with self._producer_lock:
+                batches = [self._take_bulk(buffer) for buffer in list(self._buffers.values())]
+            for batch in batches:
+                self._dispatch_bulk(batch)
 
     def get_connection_status(self) -> Dict:
         """Get detailed connection status."""
@@ -241,32 +427,32 @@ class DDEClient:
             buffer_stats = {
                 symbol: len(buffer) for symbol, buffer in self._buffers.items()
             }
+            heads = [buffer.head for buffer in self._buffers.values()]
+            ticks_received = self._ticks_retired + sum(heads)
         
         return {
             "state": self.state.value,
             "connected": self.state == DDEConnectionState.CONNECTED,
             "symbols_subscribed": len(self.config.symbols),
-            "symbols_active": len(self._stats['symbols_active']),
-            "ticks_received": self._stats['ticks_received'],
+            "symbols_active": sum(1 for head in heads if head),
+            "ticks_received": ticks_received,
             "connection_failures": self._stats['connection_failures'],
-            "last_tick_time": self._stats['last_tick_time'].isoformat() if self._stats['last_tick_time'] else None,
+            "last_tick_time": _ns_to_datetime(self._last_tick_ns).isoformat() if self._last_tick_ns is not None else None,
             "buffer_stats": buffer_stats,
             "polling_active": self._polling_active
         }
 
     def push_tick(self, symbol: str, bid: float, ask: float, timestamp: float = None):
-        """Push tick data (for testing or manual data injection)."""
-        tick_time = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
-        
-        tick = TickData(
-            symbol=symbol,
-            bid=bid,
-            ask=ask,
-            spread=ask - bid,
-            timestamp=tick_time
-        )
-        
-        self._process_tick(tick)
+        """Push tick data (for testing or manual data injection).
+
+        Safe to call from any thread, including while the polling thread is
+        delivering ticks; pushed ticks are serialized with polled ones.
+        """
+        if timestamp:
+            ts_ns = _datetime_to_ns(datetime.fromtimestamp(timestamp))
+        else:
+            ts_ns = _now_ns()
+        self._store_tick(symbol, bid, ask, ts_ns)
 
     def _subscribe_to_symbols(self):
         """Subscribe to all configured symbols."""
@@ -315,23 +501,38 @@ class DDEClient:
     def _polling_loop(self):
         """Background polling loop for DDE data."""
         poll_interval = self.config.poll_interval_ms / 1000.0  # Convert to seconds
+        monotonic = time.monotonic
+        sleep = time.sleep
+        poll_all_symbols = self._poll_all_symbols
         
+        # Sleep until fixed deadlines so polling time does not add up as drift
+        next_deadline = monotonic()
         while self._polling_active:
             try:
-                if self.state == DDEConnectionState.CONNECTED and self.connection_handle:
-                    self._poll_all_symbols()
+                next_deadline += poll_interval
+                if self.state is DDEConnectionState.CONNECTED and self.connection_handle:
+                    poll_all_symbols()
+                    self.flush_bulk_callbacks()
                 
-                time.sleep(poll_interval)
+                delay = next_deadline - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                else:
+                    next_deadline = monotonic()  # Overran; restart the cadence
                 
             except Exception as e:
                 self.logger.error(f"Polling loop error: {e}")
                 if self.state == DDEConnectionState.CONNECTED:
                     self._attempt_reconnection()
-                time.sleep(poll_interval)
+                sleep(poll_interval)
+                next_deadline = monotonic()
 
     def _poll_all_symbols(self):
         """Poll all subscribed symbols for latest data."""
-        symbol_data = {}
+        request = self.connection_handle.Request
+        connected_topics = self._connected_topics
+        last_quotes = self._last_quotes
+        store_tick = self._store_tick
         
         # Collect current data for all symbols
         for symbol in self.config.symbols:
@@ -340,23 +541,31 @@ class DDEClient:
                 ask_topic = f"{symbol}_ASK"
                 time_topic = f"{symbol}_TIME"
                 
-                if bid_topic in self._connected_topics and ask_topic in self._connected_topics:
+                if bid_topic in connected_topics and ask_topic in connected_topics:
                     # Request current values
-                    bid_data = self.connection_handle.Request(bid_topic)
-                    ask_data = self.connection_handle.Request(ask_topic)
+                    bid_data = request(bid_topic)
+                    ask_data = request(ask_topic)
                     
                     if bid_data and ask_data:
+                        # Like an advise link, only a changed quote is a tick;
+                        # comparing the raw strings means idle symbols cost no
+                        # float parsing and no TIME request
+                        quote = (bid_data, ask_data)
+                        if last_quotes.get(symbol) == quote:
+                            continue
+                        
                         try:
                             bid = float(bid_data)
                             ask = float(ask_data)
+                            last_quotes[symbol] = quote
                             
                             # Try to get server time
                             server_time = None
-                            if time_topic in self._connected_topics:
-                                time_data = self.connection_handle.Request(time_topic)
+                            if time_topic in connected_topics:
+                                time_data = request(time_topic)
                                 if time_data:
                                     try:
-                                        server_time = datetime.strptime(time_data, "%Y.%m.%d %H:%M:%S")
+                                        server_time = _parse_server_time(time_data)
                                     except ValueError as e:
                                         self.logger.debug(f"Invalid time format from server: {time_data}, error: {e}")
                                         server_time = None
@@ -364,17 +573,7 @@ class DDEClient:
                                         self.logger.error(f"Unexpected error parsing server time: {e}")
                                         server_time = None
                             
-                            # Create tick data
-                            tick = TickData(
-                                symbol=symbol,
-                                bid=bid,
-                                ask=ask,
-                                spread=ask - bid,
-                                timestamp=datetime.now(),
-                                server_time=server_time
-                            )
-                            
-                            self._process_tick(tick)
+                            store_tick(symbol, bid, ask, _now_ns(), server_time)
                             
                         except (ValueError, TypeError) as e:
                             self.logger.debug(f"Invalid price data for {symbol}: {e}")
@@ -384,22 +583,84 @@ class DDEClient:
 
     def _process_tick(self, tick: TickData):
         """Process incoming tick data."""
-        # Update statistics
-        self._stats['ticks_received'] += 1
-        self._stats['last_tick_time'] = tick.timestamp
-        self._stats['symbols_active'].add(tick.symbol)
-        
-        # Store in buffer
-        with self._buffer_lock:
-            buffer = self._buffers.setdefault(tick.symbol, deque(maxlen=self.config.buffer_size))
-            buffer.append(tick)
+        self._store_tick(
+            tick.symbol, tick.bid, tick.ask, _datetime_to_ns(tick.timestamp), tick.server_time, tick
+        )
+
+    def _store_tick(
+        self,
+        symbol: str,
+        bid: float,
+        ask: float,
+        ts_ns: int,
+        server_time: Optional[datetime] = None,
+        tick: Optional[TickData] = None,
+    ):
+        """Buffer a tick and notify callbacks.
+
+        A :class:`TickData` is only built (unless supplied as *tick*) when
+        per-tick callbacks are registered.  The tick and any due bulk batch
+        are taken under the producer lock; callbacks run after it is released
+        so a slow or re-entrant callback cannot stall other producers.
+        """
+        batch = None
+        with self._producer_lock:
+            self._last_tick_ns = ts_ns
+            
+            # Store in buffer; the ring's head doubles as its tick counter
+            buffer = self._buffers.get(symbol)
+            if buffer is None:
+                with self._buffer_lock:
+                    buffer = self._buffers.setdefault(
+                        symbol, _TickRing(symbol, self.config.buffer_size)
+                    )
+            buffer.append(bid, ask, ts_ns, server_time)
+            
+            callbacks = self._tick_callbacks
+            if callbacks and tick is None:
+                tick = TickData(
+                    symbol=symbol,
+                    bid=bid,
+                    ask=ask,
+                    spread=ask - bid,
+                    timestamp=_ns_to_datetime(ts_ns),
+                    server_time=server_time
+                )
+            
+            if self._bulk_callbacks and buffer.head - buffer.dispatched >= self.config.bulk_batch_size:
+                batch = self._take_bulk(buffer)
         
         # Notify callbacks
-        for callback in self._tick_callbacks:
+        for callback in callbacks:
             try:
                 callback(tick)
             except Exception as e:
                 self.logger.error(f"Tick callback error: {e}")
+        self._dispatch_bulk(batch)
+
+    def _take_bulk(self, buffer: _TickRing) -> Optional[Tuple[str, Dict[str, array]]]:
+        """Copy the ticks *buffer* received since the last dispatch.
+
+        The caller holds the producer lock.  Returns ``None`` if nothing is
+        pending.
+        """
+        head = buffer.head
+        pending = head - buffer.dispatched
+        if pending <= 0:
+            return None
+        buffer.dispatched = head
+        return buffer.symbol, buffer.columns(pending)
+
+    def _dispatch_bulk(self, batch: Optional[Tuple[str, Dict[str, array]]]):
+        """Hand a batch from :meth:`_take_bulk` to the bulk callbacks."""
+        if batch is None:
+            return
+        symbol, columns = batch
+        for callback in self._bulk_callbacks:
+            try:
+                callback(symbol, columns)
+            except Exception as e:
+                self.logger.error(f"Bulk tick callback error: {e}")
 
     def _attempt_reconnection(self):
         """Attempt to reconnect after connection failure."""
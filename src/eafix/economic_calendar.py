@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import random
 import re
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from urllib.request import urlopen
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+try:  # aiohttp is optional; without it async polling runs urllib in threads
+    import aiohttp
+except ImportError:  # pragma: no cover - exercised only without aiohttp
+    aiohttp = None
 
 
 @dataclass
@@ -22,18 +30,23 @@ class CalendarEventResult:
     diff_previous: Optional[float]
 
 
-def _extract_value(html: str, cls: str) -> Optional[float]:
-    """Return the numeric value contained in ``<td class=cls>``.
+# ``<td class="actual|forecast|previous">`` cells, matched in a single scan
+_FIELDS_RE = re.compile(
+    r"<td[^>]*class=[\"'](actual|forecast|previous)[\"'][^>]*>(.*?)</td>",
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_RE = re.compile(r"<.*?>")
+_FIELD_NAMES = ("actual", "forecast", "previous")
+
+
+def _parse_value(cell: str) -> Optional[float]:
+    """Return the numeric value of a table cell's inner HTML.
 
-    Values are normalized by removing percent signs and commas.  If the class is
-    not found or cannot be parsed, ``None`` is returned.
+    Values are normalized by removing tags, percent signs and commas.  If the
+    cell cannot be parsed, ``None`` is returned.
     """
 
-    pattern = rf"<td[^>]*class=[\"']{cls}[\"'][^>]*>(.*?)</td>"
-    match = re.search(pattern, html, flags=re.IGNORECASE | re.DOTALL)
-    if not match:
-        return None
-    text = re.sub("<.*?>", "", match.group(1))
+    text = _TAG_RE.sub("", cell)
     text = text.strip().replace("%", "").replace(",", "")
     try:
         return float(text)
@@ -41,6 +54,24 @@ def _extract_value(html: str, cls: str) -> Optional[float]:
         return None
 
 
+@lru_cache(maxsize=32)
+def _extract_fields(html: str) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Return the first ``actual``, ``forecast`` and ``previous`` values in *html*.
+
+    Results are memoized because polling often fetches an unchanged page.
+    """
+
+    cells = {}
+    for match in _FIELDS_RE.finditer(html):
+        cells.setdefault(match.group(1).lower(), match.group(2))
+        if len(cells) == 3:
+            break
+    return tuple(
+        _parse_value(cells[name]) if name in cells else None
+        for name in _FIELD_NAMES
+    )
+
+
 def parse_event_page(html: str) -> CalendarEventResult:
     """Parse *html* from a Forex Factory event page.
 
@@ -48,9 +79,7 @@ def parse_event_page(html: str) -> CalendarEventResult:
     values along with simple differences from ``actual``.
     """
 
-    actual = _extract_value(html, "actual")
-    forecast = _extract_value(html, "forecast")
-    previous = _extract_value(html, "previous")
+    actual, forecast, previous = _extract_fields(html)
 
     diff_forecast = actual - forecast if actual is not None and forecast is not None else None
     diff_previous = actual - previous if actual is not None and previous is not None else None
@@ -71,6 +100,10 @@ def fetch_event_result(
     ``poll_interval`` seconds.  Polling stops as soon as the ``actual`` value is
     available and differs from the last seen value.  Each update emits a
     terminal bell so users are alerted when new information arrives.
+
+    Polls after the first are conditional requests carrying the previous
+    response's ``ETag``/``Last-Modified``; a ``304 Not Modified`` reply reuses
+    the last parsed result instead of downloading the page again.
     """
 
     wait_seconds = random.randint(*delay_range)
@@ -78,18 +111,20 @@ def fetch_event_result(
 
     last_actual: Optional[float] = None
     result: CalendarEventResult | None = None
+    validators: Dict[str, str] = {}
 
     for _ in range(max_attempts):
-        with urlopen(event_url, timeout=10) as resp:  # nosec B310
-            html = resp.read().decode("utf-8", errors="replace")
+        page = _fetch_page(event_url, validators)
+        if page is not None:
+            html, validators = page
+            result = parse_event_page(html)
+        # Otherwise the page is unchanged since the last poll; keep the result
 
-        result = parse_event_page(html)
-
-        if result.actual is not None and result.actual != last_actual:
+        if _is_new_actual(result, last_actual):
             print("\a", end="")  # alert user that new information is available
             return result
 
-        last_actual = result.actual
+        last_actual = result.actual if result is not None else None
         time.sleep(poll_interval)
 
     # If we exit the loop without returning, provide the last parsed result
@@ -97,6 +132,109 @@ def fetch_event_result(
     return result if result is not None else CalendarEventResult(None, None, None, None, None)
 
 
+async def fetch_event_result_async(
+    event_url: str,
+    session: Optional["aiohttp.ClientSession"] = None,
+    delay_range: Tuple[int, int] = (120, 300),
+    poll_interval: int = 15,
+    max_attempts: int = 20,
+) -> CalendarEventResult:
+    """Asynchronous :func:`fetch_event_result` for monitoring many events at once.
+
+    Polls share *session* (an ``aiohttp.ClientSession``) when given; without
+    aiohttp installed, each poll runs the blocking fetch in a worker thread.
+    """
+
+    await asyncio.sleep(random.randint(*delay_range))
+
+    last_actual: Optional[float] = None
+    result: CalendarEventResult | None = None
+    validators: Dict[str, str] = {}
+
+    for _ in range(max_attempts):
+        if session is not None:
+            page = await _fetch_page_aiohttp(session, event_url, validators)
+        else:
+            page = await asyncio.to_thread(_fetch_page, event_url, validators)
+        if page is not None:
+            html, validators = page
+            result = parse_event_page(html)
+
+        if _is_new_actual(result, last_actual):
+            print("\a", end="")  # alert user that new information is available
+            return result
+
+        last_actual = result.actual if result is not None else None
+        await asyncio.sleep(poll_interval)
+
+    return result if result is not None else CalendarEventResult(None, None, None, None, None)
+
+
+async def fetch_event_results_async(event_urls: Iterable[str], **kwargs) -> List[CalendarEventResult]:
+    """Poll several event pages concurrently, sharing one HTTP session if possible.
+
+    Keyword arguments are passed to :func:`fetch_event_result_async`.
+    """
+
+    if aiohttp is None:
+        return list(await asyncio.gather(*(fetch_event_result_async(url, **kwargs) for url in event_urls)))
+    async with aiohttp.ClientSession() as session:
+        return list(await asyncio.gather(
+            *(fetch_event_result_async(url, session, **kwargs) for url in event_urls)
+        ))
+
+
+def _is_new_actual(result: Optional[CalendarEventResult], last_actual: Optional[float]) -> bool:
+    """Return ``True`` when *result* carries an ``actual`` value not seen before."""
+
+    return result is not None and result.actual is not None and result.actual != last_actual
+
+
+def _fetch_page(event_url: str, validators: Dict[str, str]) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Fetch *event_url* conditionally on *validators*.
+
+    Returns the decoded page and the validators for the next request, or
+    ``None`` when the server answers ``304 Not Modified``.
+    """
+
+    request = Request(event_url, headers=validators)
+    try:
+        with urlopen(request, timeout=10) as resp:  # nosec B310
+            html = resp.read().decode("utf-8", errors="replace")
+            return html, _conditional_headers(resp.headers)
+    except HTTPError as exc:
+        if exc.code == 304:
+            return None
+        raise
+
+
+async def _fetch_page_aiohttp(
+    session: "aiohttp.ClientSession", event_url: str, validators: Dict[str, str]
+) -> Optional[Tuple[str, Dict[str, str]]]:
+    """aiohttp counterpart of :func:`_fetch_page`."""
+
+    timeout = aiohttp.ClientTimeout(total=10)
+    async with session.get(event_url, headers=validators, timeout=timeout) as resp:
+        if resp.status == 304:
+            return None
+        resp.raise_for_status()
+        html = await resp.text(encoding="utf-8", errors="replace")
+        return html, _conditional_headers(resp.headers)
+
+
+def _conditional_headers(headers) -> Dict[str, str]:
+    """Return request headers that make the next fetch conditional on *headers*."""
+
+    conditional = {}
+    etag = headers.get("ETag")
+    if etag:
+        conditional["If-None-Match"] = etag
+    last_modified = headers.get("Last-Modified")
+    if last_modified:
+        conditional["If-Modified-Since"] = last_modified
+    return conditional
+
+
 def format_event_result(result: CalendarEventResult) -> str:
     """Return a human readable summary of *result* values."""
 
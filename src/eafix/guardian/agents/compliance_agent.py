@@ -1,19 +1,34 @@
 """Compliance agent for trading rule enforcement."""
 
 import logging
+import sys
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from enum import Enum
 
 
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain dataclasses
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+MAX_VIOLATIONS = 10000  # Oldest violations are dropped beyond this
+
+# rule name -> (violation type, severity, value transform, log message prefix)
+_CHECK_SPECS = {
+    "max_position_size": ("position_size_exceeded", "HIGH", None, "Position size violation for"),
+    "daily_loss_limit": ("daily_loss_exceeded", "CRITICAL", abs, "Daily loss limit violation"),
+    "max_exposure": ("exposure_exceeded", "HIGH", None, "Exposure limit violation"),
+}
+
+
 class ComplianceStatus(Enum):
     COMPLIANT = "compliant"
     VIOLATION = "violation"
     WARNING = "warning"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ComplianceRule:
     """Represents a trading compliance rule."""
     name: str
@@ -23,7 +38,7 @@ class ComplianceRule:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ComplianceViolation:
     """Represents a compliance violation."""
     rule_name: str
@@ -33,6 +48,7 @@ class ComplianceViolation:
     severity: str
     timestamp: datetime = field(default_factory=datetime.now)
     resolved: bool = False
+    violation_id: int = -1  # Position in the agent's full violation history
 
 
 @dataclass
@@ -42,7 +58,10 @@ class ComplianceAgent:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.rules: Dict[str, ComplianceRule] = {}
-        self.violations: List[ComplianceViolation] = []
+        self.violations: deque = deque(maxlen=MAX_VIOLATIONS)
+        self._next_violation_id = 0
+        # Unresolved violations keyed by violation_id, so active lookups skip resolved history
+        self._unresolved: Dict[int, ComplianceViolation] = {}
         self.monitoring_enabled = True
         
         # Initialize default rules
@@ -61,91 +80,85 @@ class ComplianceAgent:
         for rule in default_rules:
             self.rules[rule.name] = rule
     
-    def log(self, message: str) -> None:
-        """Log compliance message."""
-        self.logger.info(f"ComplianceAgent: {message}")
+    def log(self, message: str, *args: Any) -> None:
+        """Log compliance message, %-formatting *args* only if it is emitted."""
+        self.logger.info("ComplianceAgent: " + message, *args)
     
-    def check_position_size(self, symbol: str, size: float) -> ComplianceStatus:
-        """Check if position size complies with rules."""
-        rule = self.rules.get("max_position_size")
+    def _record_violation(self, violation: ComplianceViolation) -> None:
+        """Append a violation, forgetting the oldest once the history is full."""
+        if len(self.violations) == self.violations.maxlen:
+            self._unresolved.pop(self.violations[0].violation_id, None)
+        violation.violation_id = self._next_violation_id
+        self._next_violation_id += 1
+        self.violations.append(violation)
+        self._unresolved[violation.violation_id] = violation
+    
+    def _check(self, rule_name: str, value: float, subject: str = "") -> ComplianceStatus:
+        """Check *value* against the threshold rule described in _CHECK_SPECS."""
+        rule = self.rules.get(rule_name)
         if not rule or not rule.enabled:
             return ComplianceStatus.COMPLIANT
         
-        if size > rule.threshold:
-            violation = ComplianceViolation(
+        violation_type, severity, transform, message = _CHECK_SPECS[rule_name]
+        measured = transform(value) if transform else value
+        if measured > rule.threshold:
+            self._record_violation(ComplianceViolation(
                 rule_name=rule.name,
-                violation_type="position_size_exceeded",
-                current_value=size,
+                violation_type=violation_type,
+                current_value=measured,
                 threshold=rule.threshold,
-                severity="HIGH"
-            )
-            self.violations.append(violation)
-            self.log(f"Position size violation for {symbol}: {size} > {rule.threshold}")
+                severity=severity
+            ))
+            if subject:
+                self.log("%s %s: %s > %s", message, subject, value, rule.threshold)
+            else:
+                self.log("%s: %s > %s", message, value, rule.threshold)
             return ComplianceStatus.VIOLATION
         
         return ComplianceStatus.COMPLIANT
     
+    def check_position_size(self, symbol: str, size: float) -> ComplianceStatus:
+        """Check if position size complies with rules."""
+        return self._check("max_position_size", size, symbol)
+    
     def check_daily_loss(self, current_loss: float) -> ComplianceStatus:
         """Check daily loss compliance."""
-        rule = self.rules.get("daily_loss_limit")
-        if not rule or not rule.enabled:
-            return ComplianceStatus.COMPLIANT
-        
-        if abs(current_loss) > rule.threshold:
-            violation = ComplianceViolation(
-                rule_name=rule.name,
-                violation_type="daily_loss_exceeded",
-                current_value=abs(current_loss),
-                threshold=rule.threshold,
-                severity="CRITICAL"
-            )
-            self.violations.append(violation)
-            self.log(f"Daily loss limit violation: {current_loss} > {rule.threshold}")
-            return ComplianceStatus.VIOLATION
-        
-        return ComplianceStatus.COMPLIANT
+        return self._check("daily_loss_limit", current_loss)
     
     def check_exposure(self, total_exposure: float) -> ComplianceStatus:
         """Check total exposure compliance."""
-        rule = self.rules.get("max_exposure")
-        if not rule or not rule.enabled:
-            return ComplianceStatus.COMPLIANT
-        
-        if total_exposure > rule.threshold:
-            violation = ComplianceViolation(
-                rule_name=rule.name,
-                violation_type="exposure_exceeded",
-                current_value=total_exposure,
-                threshold=rule.threshold,
-                severity="HIGH"
-            )
-            self.violations.append(violation)
-            self.log(f"Exposure limit violation: {total_exposure} > {rule.threshold}")
-            return ComplianceStatus.VIOLATION
-        
-        return ComplianceStatus.COMPLIANT
+        return self._check("max_exposure", total_exposure)
     
     def get_active_violations(self) -> List[ComplianceViolation]:
         """Get all unresolved violations."""
-        return [v for v in self.violations if not v.resolved]
+        return [v for v in self._unresolved.values() if not v.resolved]
     
-    def resolve_violation(self, violation_index: int) -> bool:
-        """Mark a violation as resolved."""
-        if 0 <= violation_index < len(self.violations):
-            self.violations[violation_index].resolved = True
-            self.log(f"Resolved violation: {self.violations[violation_index].rule_name}")
-            return True
-        return False
+    def resolve_violation(self, violation_id: int) -> bool:
+        """Mark a violation as resolved.
+
+        *violation_id* is the violation's ``violation_id``, its position in
+        the full history since the agent started; it stays valid after older
+        violations are dropped.  Returns False once it is no longer retained.
+        """
+        violation = self._unresolved.pop(violation_id, None)
+        if violation is None:
+            oldest_id = self._next_violation_id - len(self.violations)
+            if not oldest_id <= violation_id < self._next_violation_id:
+                return False
+            violation = self.violations[violation_id - oldest_id]
+        violation.resolved = True
+        self.log("Resolved violation: %s", violation.rule_name)
+        return True
     
     def add_rule(self, rule: ComplianceRule) -> None:
         """Add a new compliance rule."""
         self.rules[rule.name] = rule
-        self.log(f"Added compliance rule: {rule.name}")
+        self.log("Added compliance rule: %s", rule.name)
     
     def disable_rule(self, rule_name: str) -> bool:
         """Disable a compliance rule."""
         if rule_name in self.rules:
             self.rules[rule_name].enabled = False
-            self.log(f"Disabled compliance rule: {rule_name}")
+            self.log("Disabled compliance rule: %s", rule_name)
             return True
         return False
@@ -1,16 +1,79 @@
 """Learning agent for pattern recognition and adaptive behavior."""
 
+import atexit
 import logging
+import queue
 import sqlite3
+import sys
+import threading
+import weakref
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 import json
 
+try:  # orjson is optional; the standard library json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
 
-@dataclass
+try:  # ciso8601 is optional; datetime.fromisoformat is the fallback
+    from ciso8601 import parse_datetime_as_naive as _parse_iso
+except ImportError:  # pragma: no cover - exercised only without ciso8601
+    _parse_iso = datetime.fromisoformat
+
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain dataclasses
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+EVENT_FLUSH_SIZE = 256  # Queued events written per executemany transaction
+EVENT_FLUSH_INTERVAL = 0.25  # Seconds between background writer passes
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # One fsync per checkpoint, not per commit
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialise *value* to JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    """Parse JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Agents not yet closed; weak so an agent dropped without close() can be collected
+_open_agents: "weakref.WeakSet[LearningAgent]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_agents() -> None:
+    """Flush and close every agent still open at interpreter exit."""
+    for agent in list(_open_agents):
+        agent.close()
+
+
+def _writer_loop(agent_ref: "weakref.ref[LearningAgent]", stop: threading.Event) -> None:
+    """Flush the agent every EVENT_FLUSH_INTERVAL seconds until stopped or collected."""
+    while not stop.wait(EVENT_FLUSH_INTERVAL):
+        agent = agent_ref()
+        if agent is None:
+            return
+        agent.flush()
+        del agent  # Hold no reference while waiting
+
+
+@dataclass(**_SLOTS)
 class LearningEvent:
     """Represents a learning event."""
     event_type: str
@@ -20,7 +83,7 @@ class LearningEvent:
     tags: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Pattern:
     """Represents a learned pattern."""
     pattern_id: str
@@ -40,6 +103,7 @@ class LearningAgent:
         self.db_path = Path(db_path)
         self.events: deque = deque(maxlen=10000)  # Keep recent events in memory
         self.patterns: Dict[str, Pattern] = {}
+        self._patterns_by_type: Dict[str, Dict[str, Pattern]] = defaultdict(dict)
         self.pattern_stats = defaultdict(lambda: {"success": 0, "failure": 0})
         
         # Learning parameters
@@ -47,14 +111,48 @@ class LearningAgent:
         self.min_confidence_threshold = 0.6
         self.learning_enabled = True
         
+        # Serialised event rows and pattern updates awaiting the background
+        # writer; see flush()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        
+        # One connection for the agent's lifetime; _lock serialises its use.
+        # Without a database the agent keeps learning in memory only.
+        self._lock = threading.Lock()
+        self._closed = False
+        try:
+            self.conn: Optional[sqlite3.Connection] = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open learning database: {e}")
+            self.conn = None
+        
         # Initialize database
         self._init_database()
         self._load_patterns()
+        
+        self._writer_stop = threading.Event()
+        self._writer = threading.Thread(
+            target=_writer_loop, args=(weakref.ref(self), self._writer_stop), daemon=True
+        )
+        self._writer.start()
+        _open_agents.add(self)
+    
+    def __del__(self):
+        """Flush and close an agent that was dropped without close()."""
+        if hasattr(self, "_writer"):
+            self.close()
     
     def _init_database(self) -> None:
         """Initialize the learning database."""
+        if self.conn is None:
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
+                conn = self.conn
+                for pragma in CONNECTION_PRAGMAS:
+                    conn.execute(pragma)
+                
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS learning_events (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -83,30 +181,27 @@ class LearningAgent:
                     ON learning_events(event_type, timestamp)
                 """)
                 
-                conn.commit()
-                
         except sqlite3.Error as e:
             self.logger.error(f"Failed to initialize learning database: {e}")
     
     def _load_patterns(self) -> None:
         """Load existing patterns from database."""
+        if self.conn is None:
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM patterns")
+            with self._lock:
+                rows = self.conn.execute("""
+                    SELECT pattern_id, pattern_type, conditions, success_rate,
+                           occurrences, last_seen, confidence
+                    FROM patterns
+                """).fetchall()
+            
+            for pattern_id, pattern_type, conditions, success_rate, occurrences, last_seen, confidence in rows:
+                self._add_pattern(Pattern(
+                    pattern_id, pattern_type, _json_loads(conditions), success_rate,
+                    occurrences, _parse_iso(last_seen), confidence
+                ))
                 
-                for row in cursor.fetchall():
-                    pattern = Pattern(
-                        pattern_id=row[0],
-                        pattern_type=row[1],
-                        conditions=json.loads(row[2]),
-                        success_rate=row[3],
-                        occurrences=row[4],
-                        last_seen=datetime.fromisoformat(row[5]),
-                        confidence=row[6]
-                    )
-                    self.patterns[pattern.pattern_id] = pattern
-                    
         except sqlite3.Error as e:
             self.logger.error(f"Failed to load patterns: {e}")
     
@@ -138,24 +233,89 @@ class LearningAgent:
             self.logger.error(f"Failed to record learning event: {e}")
     
     def _store_event(self, event: LearningEvent) -> None:
-        """Store event in database."""
+        """Serialise event and queue the row for the background writer.
+
+        Serialising here rather than on the writer means a caller mutating
+        its ``data`` dict after record() returns cannot change what is stored.
+        """
+        if self.conn is None:
+            return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO learning_events 
-                    (event_type, data, outcome, timestamp, tags)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    event.event_type,
-                    json.dumps(event.data),
-                    event.outcome,
-                    event.timestamp.isoformat(),
-                    json.dumps(event.tags)
-                ))
-                conn.commit()
-                
-        except sqlite3.Error as e:
-            self.logger.error(f"Failed to store event: {e}")
+            row = (
+                event.event_type,
+                _json_dumps(event.data),
+                event.outcome,
+                event.timestamp.isoformat(),
+                _json_dumps(event.tags)
+            )
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Failed to serialise learning event: {e}")
+            return
+        self._queue.put(row)
+    
+    def flush(self) -> None:
+        """Write every queued event and pattern update to the database."""
+        with self._lock:
+            self._write_queued()
+    
+    def _drain_queue(self, max_items: int) -> List[Any]:
+        """Take up to *max_items* queued items without blocking."""
+        batch = []
+        while len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write_queued(self) -> None:
+        """Insert queued event rows and patterns in batches; the caller holds _lock."""
+        if self.conn is None:
+            return
+        batch = self._drain_queue(EVENT_FLUSH_SIZE)
+        while batch:
+            events = []
+            patterns = {}  # Only the latest state of each pattern needs to be written
+            for item in batch:
+                if not isinstance(item, Pattern):
+                    events.append(item)  # Serialised by _store_event
+                    continue
+                try:
+                    patterns[item.pattern_id] = (
+                        item.pattern_id,
+                        item.pattern_type,
+                        _json_dumps(item.conditions),
+                        item.success_rate,
+                        item.occurrences,
+                        item.last_seen.isoformat(),
+                        item.confidence
+                    )
+                except (TypeError, ValueError) as e:
+                    self.logger.error(f"Failed to serialise learning pattern: {e}")
+            
+            try:
+                conn = self.conn
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany("""
+                        INSERT INTO learning_events 
+                        (event_type, data, outcome, timestamp, tags)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, events)
+                    conn.executemany("""
+                        INSERT OR REPLACE INTO patterns 
+                        (pattern_id, pattern_type, conditions, success_rate, occurrences, last_seen, confidence)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, patterns.values())
+                    conn.execute("COMMIT")
+                except sqlite3.Error:
+                    conn.execute("ROLLBACK")
+                    raise
+                    
+            except sqlite3.Error as e:
+                self.logger.error(f"Failed to store {len(events)} events: {e}")
+            
+            batch = self._drain_queue(EVENT_FLUSH_SIZE)
     
     def _update_patterns(self, event: LearningEvent) -> None:
         """Update pattern recognition based on new event."""
@@ -185,58 +345,49 @@ class LearningAgent:
                             last_seen=event.timestamp,
                             confidence=confidence
                         )
-                        self.patterns[pattern_key] = pattern
+                        self._add_pattern(pattern)
                         self._store_pattern(pattern)
                         
         except Exception as e:
             self.logger.error(f"Failed to update patterns: {e}")
     
+    def _add_pattern(self, pattern: Pattern) -> None:
+        """Register pattern in memory, indexed by id and by type."""
+        self.patterns[pattern.pattern_id] = pattern
+        self._patterns_by_type[pattern.pattern_type][pattern.pattern_id] = pattern
+    
     def _store_pattern(self, pattern: Pattern) -> None:
-        """Store pattern in database."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO patterns 
-                    (pattern_id, pattern_type, conditions, success_rate, occurrences, last_seen, confidence)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    pattern.pattern_id,
-                    pattern.pattern_type,
-                    json.dumps(pattern.conditions),
-                    pattern.success_rate,
-                    pattern.occurrences,
-                    pattern.last_seen.isoformat(),
-                    pattern.confidence
-                ))
-                conn.commit()
-                
-        except sqlite3.Error as e:
-            self.logger.error(f"Failed to store pattern: {e}")
+        """Queue pattern for the background writer."""
+        if self.conn is not None:
+            self._queue.put(pattern)
     
     def get_patterns(self, pattern_type: Optional[str] = None, min_confidence: float = 0.0) -> List[Pattern]:
         """Get learned patterns matching criteria."""
-        patterns = []
-        for pattern in self.patterns.values():
-            if pattern_type and pattern.pattern_type != pattern_type:
-                continue
-            if pattern.confidence < min_confidence:
-                continue
-            patterns.append(pattern)
+        candidates = self._typed_patterns(pattern_type) if pattern_type else self.patterns.values()
+        patterns = [p for p in candidates if p.confidence >= min_confidence]
         
         # Sort by confidence descending
         return sorted(patterns, key=lambda p: p.confidence, reverse=True)
     
     def predict_outcome(self, event_type: str, data: Dict[str, Any]) -> Optional[Tuple[str, float]]:
         """Predict outcome based on learned patterns."""
-        matching_patterns = self.get_patterns(pattern_type=event_type, min_confidence=self.min_confidence_threshold)
+        # Use the most confident pattern; only the maximum is needed, not a full sort
+        best_pattern = max(
+            (p for p in self._typed_patterns(event_type) if p.confidence >= self.min_confidence_threshold),
+            key=lambda p: p.confidence,
+            default=None
+        )
         
-        if not matching_patterns:
+        if best_pattern is None:
             return None
         
-        # Use the most confident pattern
-        best_pattern = matching_patterns[0]
         return ("success" if best_pattern.success_rate > 0.5 else "failure", best_pattern.confidence)
     
+    def _typed_patterns(self, pattern_type: str):
+        """Patterns of one type, without creating an empty index entry."""
+        by_type = self._patterns_by_type.get(pattern_type)
+        return by_type.values() if by_type else ()
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get learning agent statistics."""
         return {
@@ -247,17 +398,34 @@ class LearningAgent:
             "pattern_types": list(set(p.pattern_type for p in self.patterns.values()))
         }
     
+    def close(self) -> None:
+        """Flush buffered events and patterns, then close the database connection."""
+        if self._closed:
+            return
+        self._closed = True
+        _open_agents.discard(self)
+        self._writer_stop.set()
+        if self._writer is not threading.current_thread():
+            self._writer.join(timeout=5)
+        with self._lock:
+            if self.conn is not None:
+                self._write_queued()
+                self.conn.close()
+                self.conn = None
+    
     def cleanup_old_data(self, days: int = 30) -> None:
         """Clean up old learning data."""
         cutoff_date = datetime.now() - timedelta(days=days)
+        self.flush()
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._lock:
+                if self.conn is None:
+                    return
+                self.conn.execute("""
                     DELETE FROM learning_events 
                     WHERE datetime(timestamp) < ?
                 """, (cutoff_date.isoformat(),))
-                conn.commit()
                 
             self.logger.info(f"Cleaned up learning data older than {days} days")
             
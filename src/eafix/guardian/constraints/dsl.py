@@ -2,17 +2,133 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import ast
+import operator
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Node types a constraint expression may contain: literals, context names,
+# boolean logic, arithmetic and comparisons
+_ALLOWED_NODES = frozenset((
+    ast.Expression, ast.Constant, ast.Name, ast.Load,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.Tuple, ast.List,
+))
+
+# Largest integer power (in bits) and repeated sequence a constraint may
+# build; beyond these ``**`` and ``*`` would hang or exhaust memory
+_MAX_POW_BITS = 1 << 16
+_MAX_REPEAT_LEN = 100_000
+
+
+def _checked_pow(base: Any, exponent: Any) -> Any:
+    if (
+        isinstance(base, int) and isinstance(exponent, int)
+        and exponent > 1 and base not in (-1, 0, 1)
+        and base.bit_length() * exponent > _MAX_POW_BITS
+    ):
+        raise ValueError("Constraint power is too large")
+    return base ** exponent
+
+
+def _checked_mul(left: Any, right: Any) -> Any:
+    for seq, count in ((left, right), (right, left)):
+        if isinstance(seq, (str, bytes, tuple, list)) and isinstance(count, int):
+            if len(seq) * count > _MAX_REPEAT_LEN:
+                raise ValueError("Constraint repetition is too large")
+    return left * right
+
+
+# ``**`` and ``*`` are compiled as calls to the checked helpers above
+_GUARDS = {ast.Pow: "__dsl_pow__", ast.Mult: "__dsl_mul__"}
+_GUARD_NAMES = frozenset(_GUARDS.values())
+
+_EMPTY_GLOBALS: Dict[str, Any] = {
+    "__builtins__": {}, "__dsl_pow__": _checked_pow, "__dsl_mul__": _checked_mul,
+}
+
+# Comparison operators the single-comparison fast path evaluates directly
+_FAST_COMPARE = {
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+}
+
+
+class _Validator(ast.NodeVisitor):
+    """Reject any syntax outside the constraint grammar."""
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if type(node) not in _ALLOWED_NODES:
+            raise ValueError(f"Unsupported constraint syntax: {type(node).__name__}")
+        super().generic_visit(node)
+
+
+class _GuardArithmetic(ast.NodeTransformer):
+    """Route ``**`` and ``*`` through their size-checked helpers."""
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        guard = _GUARDS.get(type(node.op))
+        if guard is None:
+            return node
+        call = ast.Call(func=ast.Name(guard, ast.Load()), args=[node.left, node.right], keywords=[])
+        return ast.copy_location(call, node)
+
+
+def _fast_path(node: ast.AST) -> Optional[Callable[[Mapping[str, Any]], Any]]:
+    """Return a closure for ``name <op> constant`` or ``name <op> name``, else None."""
+    if type(node) is not ast.Compare or len(node.ops) != 1 or type(node.left) is not ast.Name:
+        return None
+    op = _FAST_COMPARE.get(type(node.ops[0]))
+    right = node.comparators[0]
+    if op is None:
+        return None
+    key = node.left.id
+    if type(right) is ast.Constant:
+        value = right.value
+        return lambda context: op(context[key], value)
+    if type(right) is ast.Name:
+        other = right.id
+        return lambda context: op(context[key], context[other])
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str) -> Tuple[Optional[Callable[[Mapping[str, Any]], Any]], Optional[CodeType]]:
+    """Validate and compile *expression* once; constraint expressions are reused heavily.
+
+    Single comparisons, the most common constraint shape, become a direct
+    closure; everything else is compiled to bytecode for eval.
+    """
+    tree = ast.parse(expression, "<dsl>", "eval")
+    _Validator().visit(tree)
+    fast = _fast_path(tree.body)
+    if fast is not None:
+        return fast, None
+    tree = ast.fix_missing_locations(_GuardArithmetic().visit(tree))
+    return None, compile(tree, "<dsl>", "eval")
 
 
 def evaluate(expression: str, context: Dict[str, Any]) -> bool:
-    """Very small eval wrapper used only for tests.
+    """Evaluate a constraint *expression* against *context*.
 
-    WARNING: uses Python's eval and therefore must not be used in
-    production without proper sandboxing.
+    Expressions are limited to literals, context names, boolean logic,
+    arithmetic and comparisons; anything else (calls, attribute access,
+    subscripts, lambdas...) is rejected before compilation, and powers or
+    repetitions too large to compute safely fail at evaluation.  Invalid or
+    failing expressions evaluate to ``False``.
     """
     try:
-        return bool(eval(expression, {}, context))
+        fast, code = _compile(expression)
+        if fast is not None:
+            return bool(fast(context))
+        if not _GUARD_NAMES.isdisjoint(context):
+            return False  # Context keys would shadow the arithmetic guards
+        return bool(eval(code, _EMPTY_GLOBALS, context))
     except Exception:
         return False
-
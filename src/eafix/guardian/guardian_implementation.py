@@ -8,15 +8,109 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import time
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, NamedTuple, Optional, Callable
 import sqlite3
 
+try:  # orjson is optional; the standard library json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+MAX_ALERTS = 100  # Alerts kept in memory; older ones are dropped
+LOG_BATCH_SIZE = 256  # Queued log rows written per writer transaction
+LOG_QUEUE_MAX_ROWS = 10000  # Rows beyond this are written synchronously instead of queued
+
+_HEALTH_LOG_INSERT = "INSERT INTO health_log (timestamp, status, details) VALUES (?, ?, ?)"
+_ALERT_LOG_INSERT = (
+    "INSERT INTO alert_log (timestamp, type, component, message, severity) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Multi-row INSERT sizes the writer uses before falling back to executemany
+_MULTI_ROW_CHUNKS = (128, 32, 8)
+
+_WRITER_STOP = object()  # Queue sentinel that ends the database writer thread
+
+_iso_cache = (0, "")  # (epoch milliseconds, ISO text); replaced as a whole so readers never tear
+
+
+def _now_iso() -> str:
+    """Return the current local time as ISO text, formatted at most once per millisecond."""
+    global _iso_cache
+    now_ns = time.time_ns()
+    millis, text = _iso_cache
+    if now_ns // 1_000_000 != millis:
+        text = datetime.fromtimestamp(now_ns / 1e9).isoformat()
+        _iso_cache = (now_ns // 1_000_000, text)
+    return text
+
+
+class _MemoryInfo(NamedTuple):
+    """The subset of psutil.virtual_memory() the memory check reads."""
+    available: int
+    percent: float
+
+
+def _read_proc_meminfo() -> Optional[_MemoryInfo]:
+    """Read memory usage straight from /proc/meminfo; None where it is unavailable."""
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    fields = {}
+    for line in data.splitlines():
+        key, _, rest = line.partition(b":")
+        if key in (b"MemTotal", b"MemAvailable"):
+            fields[key] = int(rest.split()[0]) * 1024  # Reported in kB
+    total = fields.get(b"MemTotal")
+    available = fields.get(b"MemAvailable")
+    if not total or available is None:
+        return None
+    return _MemoryInfo(available, round((total - available) / total * 100, 1))  # psutil rounds too
+
+
+@lru_cache(maxsize=None)
+def _multi_row_statement(statement: str, rows: int) -> str:
+    """Extend a single-row ``INSERT ... VALUES (?, ...)`` to insert *rows* rows at once."""
+    placeholders = statement.rpartition("VALUES ")[2]
+    return statement + ", " + ", ".join([placeholders] * (rows - 1))
+
+
+def _insert_rows(conn: sqlite3.Connection, statement: str, rows: List[tuple]):
+    """Insert *rows* using as few statement executions as possible."""
+    start = 0
+    for size in _MULTI_ROW_CHUNKS:
+        while len(rows) - start >= size:
+            chunk = rows[start:start + size]
+            conn.execute(_multi_row_statement(statement, size), [v for row in chunk for v in row])
+            start += size
+    if start < len(rows):
+        conn.executemany(statement, rows[start:])
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialise *value* to compact JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+    "PRAGMA mmap_size=268435456",
+)
+
 
 class SystemMode(Enum):
     """Trading system operational modes."""
@@ -33,9 +127,8 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "HALF_OPEN"  # Testing recovery
 
 
-@dataclass
-class HealthMetric:
-    """Health metric data point."""
+class HealthMetric(NamedTuple):
+    """Health metric data point; an immutable snapshot once recorded."""
     name: str
     value: float
     threshold: float
@@ -57,15 +150,19 @@ class CircuitBreaker:
     last_failure_time: Optional[datetime] = field(default=None)
     state: CircuitBreakerState = field(default=CircuitBreakerState.CLOSED)
     half_open_calls: int = field(default=0)
+    last_failure_monotonic_ns: Optional[int] = field(default=None, repr=False)
+    # Guards state transitions; calls arrive from the pulse, health and caller threads
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """Execute function through circuit breaker protection."""
-        if self.state == CircuitBreakerState.OPEN:
-            if self._should_attempt_reset():
-                self.state = CircuitBreakerState.HALF_OPEN
-                self.half_open_calls = 0
-            else:
-                raise Exception(f"Circuit breaker {self.name} is OPEN")
+        if self.state is CircuitBreakerState.OPEN:
+            with self._lock:
+                if self.state is CircuitBreakerState.OPEN:
+                    if not self._should_attempt_reset():
+                        raise Exception(f"Circuit breaker {self.name} is OPEN")
+                    self.state = CircuitBreakerState.HALF_OPEN
+                    self.half_open_calls = 0
 
         try:
             result = func(*args, **kwargs)
@@ -77,29 +174,38 @@ class CircuitBreaker:
 
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
-        if not self.last_failure_time:
+        if self.last_failure_monotonic_ns is None:
             return True
-        return datetime.now() - self.last_failure_time > timedelta(seconds=self.timeout_seconds)
+        return time.monotonic_ns() - self.last_failure_monotonic_ns > self.timeout_seconds * 1_000_000_000
 
     def _on_success(self):
         """Handle successful call."""
-        if self.state == CircuitBreakerState.HALF_OPEN:
-            self.half_open_calls += 1
-            if self.half_open_calls >= self.half_open_max_calls:
-                self.state = CircuitBreakerState.CLOSED
-                self.failure_count = 0
-        elif self.state == CircuitBreakerState.CLOSED:
-            self.failure_count = max(0, self.failure_count - 1)
+        # Healthy steady state: nothing to update, so skip the lock
+        if self.state is CircuitBreakerState.CLOSED and self.failure_count == 0:
+            return
+        with self._lock:
+            if self.state is CircuitBreakerState.HALF_OPEN:
+                self.half_open_calls += 1
+                if self.half_open_calls >= self.half_open_max_calls:
+                    self.state = CircuitBreakerState.CLOSED
+                    self.failure_count = 0
+            elif self.state is CircuitBreakerState.CLOSED:
+                self.failure_count = max(0, self.failure_count - 1)
 
     def _on_failure(self):
         """Handle failed call."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.now()
-        
-        if self.failure_count >= self.failure_threshold:
-            self.state = CircuitBreakerState.OPEN
-        elif self.state == CircuitBreakerState.HALF_OPEN:
-            self.state = CircuitBreakerState.OPEN
+        with self._lock:
+            self.last_failure_time = datetime.now()
+            self.last_failure_monotonic_ns = time.monotonic_ns()
+            if self.state is CircuitBreakerState.OPEN:
+                # Already tripped by a concurrent call; the count has done its job
+                return
+            
+            self.failure_count += 1
+            if self.failure_count >= self.failure_threshold:
+                self.state = CircuitBreakerState.OPEN
+            elif self.state is CircuitBreakerState.HALF_OPEN:
+                self.state = CircuitBreakerState.OPEN
 
 
 @dataclass
@@ -114,11 +220,16 @@ class GuardianConfig:
     max_tick_processing_time_ms: int = 2000
     max_ui_update_time_ms: int = 500
     max_failover_time_ms: int = 10000
+    component_check_timeout_seconds: float = 5.0
     
     # Circuit breaker configs
     dde_failure_threshold: int = 3
     ea_failure_threshold: int = 5
     transport_failure_threshold: int = 4
+    
+    # SQLite durability/throughput trade-off for the Guardian database
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
 
 
 class GuardianOrchestrator:
@@ -131,7 +242,7 @@ class GuardianOrchestrator:
         # System state
         self.mode = SystemMode.NORMAL
         self.health_metrics: Dict[str, HealthMetric] = {}
-        self.alerts: List[Dict] = []
+        self.alerts: List[Dict] = []  # Most recent MAX_ALERTS alerts, oldest first
         
         # Circuit breakers
         self.circuit_breakers = {
@@ -145,6 +256,33 @@ class GuardianOrchestrator:
         self._pulse_thread = None
         self._health_thread = None
         
+        # While monitoring, log rows are queued as (statement, params) and written
+        # by one writer thread; otherwise they are written synchronously.
+        # _writer_lock keeps the enqueue-or-write decision consistent with start/stop.
+        self._log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAX_ROWS)
+        self._db_writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        
+        # Component checks, bound once rather than rebuilt on every check()
+        self._component_checks: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "dde_connection": self._check_dde_connection,
+            "ea_bridge": self._check_ea_bridge,
+            "transport_layer": self._check_transport_layer,
+            "database": self._check_database,
+            "disk_space": self._check_disk_space,
+            "memory_usage": self._check_memory_usage
+        }
+        
+        # Per-component alert fields, filled in by _alert_template()
+        self._alert_templates: Dict[str, Dict[str, str]] = {}
+        
+        # Component checks run concurrently on a pool created on first check().
+        # A check still running from an earlier tick is not resubmitted, so each
+        # component holds at most one of the pool's workers.
+        self._check_pool: Optional[ThreadPoolExecutor] = None
+        self._check_pool_lock = threading.Lock()
+        self._check_futures: Dict[str, Future] = {}
+        
         # Database for persistence
         self._init_database()
 
@@ -153,6 +291,12 @@ class GuardianOrchestrator:
         self.logger.info("Starting Guardian monitoring systems")
         self._monitoring_active = True
         
+        # Start the database writer before the monitors produce log rows
+        with self._writer_lock:
+            if self._db_writer is None:
+                self._db_writer = threading.Thread(target=self._db_writer_loop, daemon=True)
+                self._db_writer.start()
+        
         # Start pulse monitoring
         self._pulse_thread = threading.Thread(target=self._pulse_monitor, daemon=True)
         self._pulse_thread.start()
@@ -171,43 +315,59 @@ class GuardianOrchestrator:
         if self._health_thread:
             self._health_thread.join(timeout=5)
         
+        self._stop_db_writer()
+        
+        self._shutdown_check_pool()
+        
         # Close any open database connections
         self._close_database_connections()
 
     def check(self) -> Dict[str, Any]:
         """Comprehensive system health check."""
         health_status = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "mode": self.mode.value,
             "overall_status": "OK",
             "components": {},
             "circuit_breakers": {},
             "metrics": {},
-            "alerts": self.alerts[-10:]  # Last 10 alerts
+            "alerts": self.recent_alerts(10)
         }
 
-        # Check each component
-        components = {
-            "dde_connection": self._check_dde_connection,
-            "ea_bridge": self._check_ea_bridge, 
-            "transport_layer": self._check_transport_layer,
-            "database": self._check_database,
-            "disk_space": self._check_disk_space,
-            "memory_usage": self._check_memory_usage
-        }
+        components = self._component_checks
+
+        # Most checks wait on I/O, so run them side by side: wall time is the
+        # slowest check rather than the sum of all of them
+        futures = self._submit_checks(components)
+        deadline = time.monotonic() + self.config.component_check_timeout_seconds
 
         critical_failures = 0
-        for name, check_func in components.items():
+        for name, future in futures.items():
+            if future is None:
+                health_status["components"][name] = {
+                    "status": "ERROR",
+                    "message": "Check timed out; previous run still in progress",
+                    "timestamp": _now_iso()
+                }
+                critical_failures += 1
+                continue
             try:
-                status = check_func()
+                status = future.result(timeout=max(0.0, deadline - time.monotonic()))
                 health_status["components"][name] = status
                 if status["status"] == "CRITICAL":
                     critical_failures += 1
+            except FutureTimeoutError:
+                health_status["components"][name] = {
+                    "status": "ERROR",
+                    "message": f"Check timed out after {self.config.component_check_timeout_seconds}s",
+                    "timestamp": _now_iso()
+                }
+                critical_failures += 1
             except Exception as e:
                 health_status["components"][name] = {
                     "status": "ERROR",
                     "message": str(e),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
                 critical_failures += 1
 
@@ -242,6 +402,38 @@ class GuardianOrchestrator:
 
         return health_status
 
+    def _submit_checks(self, components: Dict[str, Callable[[], Dict[str, Any]]]) -> Dict[str, Optional[Future]]:
+        """Submit each component check, or map it to None while its last run is still going."""
+        with self._check_pool_lock:
+            if self._check_pool is None:
+                self._check_pool = ThreadPoolExecutor(
+                    max_workers=len(components), thread_name_prefix="guardian-check"
+                )
+            futures: Dict[str, Optional[Future]] = {}
+            for name, check_func in components.items():
+                previous = self._check_futures.get(name)
+                if previous is not None and not previous.done():
+                    futures[name] = None
+                else:
+                    futures[name] = self._check_futures[name] = self._check_pool.submit(check_func)
+            return futures
+
+    def _shutdown_check_pool(self):
+        """Shut down the component check pool; a later check() creates a new one."""
+        with self._check_pool_lock:
+            pool, self._check_pool = self._check_pool, None
+            self._check_futures.clear()
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Stop monitoring if active and release the check pool and database writer."""
+        if self._monitoring_active:
+            self.stop_monitoring()
+        else:
+            self._shutdown_check_pool()
+            self._stop_db_writer()
+
     def _pulse_monitor(self):
         """Monitor system pulse at regular intervals."""
         while self._monitoring_active:
@@ -287,27 +479,27 @@ class GuardianOrchestrator:
                     "status": "CRITICAL",
                     "response_time_ms": response_time * 1000,
                     "message": "DDE connection timeout",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             elif response_time > 1.0:
                 return {
                     "status": "WARNING", 
                     "response_time_ms": response_time * 1000,
                     "message": "DDE connection slow",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
                     "status": "OK",
                     "response_time_ms": response_time * 1000,
                     "message": "DDE connection healthy",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except Exception as e:
             return {
                 "status": "CRITICAL",
                 "message": f"DDE check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _check_ea_bridge(self) -> Dict[str, Any]:
@@ -323,20 +515,20 @@ class GuardianOrchestrator:
                     "status": "CRITICAL",
                     "response_time_ms": response_time * 1000,
                     "message": "EA bridge timeout",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
                     "status": "OK",
                     "response_time_ms": response_time * 1000,
                     "message": "EA bridge responsive",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except Exception as e:
             return {
                 "status": "CRITICAL",
                 "message": f"EA bridge check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _check_transport_layer(self) -> Dict[str, Any]:
@@ -355,27 +547,27 @@ class GuardianOrchestrator:
                     "status": "CRITICAL",
                     "healthy_transports": healthy_transports,
                     "message": "All transports failed",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             elif len(healthy_transports) < len(transports):
                 return {
                     "status": "WARNING",
                     "healthy_transports": healthy_transports,
                     "message": f"Some transports failed: {set(transports) - set(healthy_transports)}",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
                     "status": "OK",
                     "healthy_transports": healthy_transports,
                     "message": "All transports healthy",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except Exception as e:
             return {
                 "status": "CRITICAL",
                 "message": f"Transport check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _check_database(self) -> Dict[str, Any]:
@@ -396,20 +588,20 @@ class GuardianOrchestrator:
                     "status": "WARNING",
                     "response_time_ms": response_time,
                     "message": "Database slow",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
                     "status": "OK", 
                     "response_time_ms": response_time,
                     "message": "Database healthy",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except Exception as e:
             return {
                 "status": "CRITICAL",
                 "message": f"Database check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _check_disk_space(self) -> Dict[str, Any]:
@@ -426,7 +618,7 @@ class GuardianOrchestrator:
                     "free_percent": free_percent,
                     "free_mb": free // (1024 * 1024),
                     "message": "Disk space critically low",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             elif free_percent < 15:
                 return {
@@ -434,7 +626,7 @@ class GuardianOrchestrator:
                     "free_percent": free_percent,
                     "free_mb": free // (1024 * 1024),
                     "message": "Disk space low",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
@@ -442,21 +634,22 @@ class GuardianOrchestrator:
                     "free_percent": free_percent,
                     "free_mb": free // (1024 * 1024),
                     "message": "Disk space adequate",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except Exception as e:
             return {
                 "status": "WARNING",
                 "message": f"Disk check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _check_memory_usage(self) -> Dict[str, Any]:
         """Check system memory usage."""
         try:
-            import psutil
-            
-            memory = psutil.virtual_memory()
+            memory = _read_proc_meminfo()
+            if memory is None:
+                import psutil
+                memory = psutil.virtual_memory()
             memory_percent = memory.percent
             
             if memory_percent > 90:
@@ -465,7 +658,7 @@ class GuardianOrchestrator:
                     "memory_percent": memory_percent,
                     "available_mb": memory.available // (1024 * 1024),
                     "message": "Memory usage critically high",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             elif memory_percent > 80:
                 return {
@@ -473,7 +666,7 @@ class GuardianOrchestrator:
                     "memory_percent": memory_percent,
                     "available_mb": memory.available // (1024 * 1024),
                     "message": "Memory usage high",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
             else:
                 return {
@@ -481,19 +674,19 @@ class GuardianOrchestrator:
                     "memory_percent": memory_percent,
                     "available_mb": memory.available // (1024 * 1024),
                     "message": "Memory usage normal",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }
         except ImportError:
             return {
                 "status": "WARNING",
                 "message": "psutil not available for memory monitoring",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
         except Exception as e:
             return {
                 "status": "WARNING",
                 "message": f"Memory check failed: {e}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
 
     def _test_transport(self, transport_type: str) -> bool:
@@ -560,8 +753,8 @@ class GuardianOrchestrator:
             self.logger.warning(f"System mode changed from {old_mode.value} to {new_mode.value}")
             
             # Record mode change alert
-            self.alerts.append({
-                "timestamp": datetime.now().isoformat(),
+            self._raise_alert({
+                "timestamp": _now_iso(),
                 "type": "MODE_CHANGE",
                 "message": f"System mode changed from {old_mode.value} to {new_mode.value}",
                 "severity": "HIGH" if new_mode in [SystemMode.SAFE_MODE, SystemMode.EMERGENCY_STOP] else "MEDIUM"
@@ -570,41 +763,163 @@ class GuardianOrchestrator:
     def _log_health_status(self, health_status: Dict):
         """Log health status to database."""
         try:
-            with sqlite3.connect(self.config.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO health_log (timestamp, status, details)
-                    VALUES (?, ?, ?)
-                """, (
-                    health_status["timestamp"],
-                    health_status["overall_status"],
-                    json.dumps(health_status)
-                ))
-                conn.commit()
+            self._queue_log_row(_HEALTH_LOG_INSERT, (
+                health_status["timestamp"],
+                health_status["overall_status"],
+                _json_dumps(health_status)
+            ))
         except Exception as e:
             self.logger.error(f"Failed to log health status: {e}")
 
+    def _queue_log_row(self, statement: str, params: tuple):
+        """Hand a row to the writer thread, or write it now when no writer is running."""
+        with self._writer_lock:
+            if self._db_writer is not None:
+                try:
+                    self._log_queue.put_nowait((statement, params))
+                    return
+                except queue.Full:
+                    self.logger.warning("Guardian log queue full; writing row synchronously")
+        self._write_log_rows([(statement, params)])
+
+    def _write_log_rows(self, items: List[tuple], conn: Optional[sqlite3.Connection] = None):
+        """Write (statement, params) *items* in one transaction.
+
+        Uses *conn* when given, otherwise a short-lived connection.
+        """
+        rows_by_statement: Dict[str, List[tuple]] = {}
+        for statement, params in items:
+            rows_by_statement.setdefault(statement, []).append(params)
+        
+        try:
+            own_conn = conn is None
+            if own_conn:
+                conn = sqlite3.connect(self.config.db_path)
+                self._apply_pragmas(conn)
+            try:
+                with conn:  # One transaction, one commit per batch
+                    for statement, rows in rows_by_statement.items():
+                        _insert_rows(conn, statement, rows)
+            finally:
+                if own_conn:
+                    conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to write {len(items)} log rows: {e}")
+
+    def _db_writer_loop(self):
+        """Write queued log rows in batches over one long-lived connection."""
+        try:
+            conn = sqlite3.connect(self.config.db_path)
+            self._apply_pragmas(conn)
+        except sqlite3.Error as e:
+            self.logger.error(f"Guardian database writer could not open {self.config.db_path}: {e}")
+            self._abandon_db_writer()
+            return
+        
+        try:
+            while True:
+                batch = [self._log_queue.get()]
+                while len(batch) < LOG_BATCH_SIZE:
+                    try:
+                        batch.append(self._log_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                items = [item for item in batch if item is not _WRITER_STOP]
+                if items:
+                    self._write_log_rows(items, conn)
+                if len(items) < len(batch):
+                    return
+        except Exception as e:
+            self.logger.error(f"Guardian database writer failed: {e}")
+            self._abandon_db_writer()
+        finally:
+            conn.close()
+
+    def _abandon_db_writer(self):
+        """After the writer thread fails, write synchronously and flush what it left queued."""
+        with self._writer_lock:
+            if self._db_writer is threading.current_thread():
+                self._db_writer = None
+        self._drain_log_queue()
+
+    def _stop_db_writer(self):
+        """Stop the writer thread after it has written every queued row."""
+        with self._writer_lock:
+            writer, self._db_writer = self._db_writer, None
+        if writer is None:
+            return
+        try:
+            self._log_queue.put(_WRITER_STOP, timeout=5)
+        except queue.Full:
+            self.logger.error("Guardian log queue full; stopping writer without sentinel")
+        writer.join(timeout=5)
+        if not writer.is_alive():
+            # Rows the writer never reached (it stopped early or failed) are written here
+            self._drain_log_queue()
+
+    def _drain_log_queue(self):
+        """Synchronously write every row still queued."""
+        items = []
+        while True:
+            try:
+                item = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _WRITER_STOP:
+                items.append(item)
+        for start in range(0, len(items), LOG_BATCH_SIZE):
+            self._write_log_rows(items[start:start + LOG_BATCH_SIZE])
+
     def _process_alerts(self, health_status: Dict):
         """Process and generate alerts based on health status."""
         # Generate alerts for critical components
+        timestamp = None
         for name, component in health_status["components"].items():
             if component["status"] == "CRITICAL":
-                self.alerts.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "COMPONENT_FAILURE",
-                    "component": name,
-                    "message": component.get("message", f"{name} critical failure"),
-                    "severity": "HIGH"
-                })
-        
-        # Trim old alerts
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
+                if timestamp is None:
+                    timestamp = _now_iso()
+                alert = {"timestamp": timestamp, **self._alert_template(name)}
+                if "message" in component:
+                    alert["message"] = component["message"]
+                self._raise_alert(alert)
+
+    def _raise_alert(self, alert: Dict[str, Any]):
+        """Keep *alert* in memory and persist it to the alert_log table."""
+        self.alerts.append(alert)
+        if len(self.alerts) > MAX_ALERTS:
+            del self.alerts[0]  # One alert per append, so this keeps the list at MAX_ALERTS
+        self._queue_log_row(_ALERT_LOG_INSERT, (
+            alert["timestamp"],
+            alert["type"],
+            alert.get("component"),
+            alert["message"],
+            alert["severity"]
+        ))
+
+    def recent_alerts(self, count: int) -> List[Dict]:
+        """Return up to *count* of the most recent alerts, oldest first."""
+        return self.alerts[-count:] if count > 0 else []
+
+    def _alert_template(self, name: str) -> Dict[str, str]:
+        """Return the cached COMPONENT_FAILURE alert fields for component *name*."""
+        template = self._alert_templates.get(name)
+        if template is None:
+            template = self._alert_templates[name] = {
+                "type": "COMPONENT_FAILURE",
+                "component": name,
+                "message": f"{name} critical failure",
+                "severity": "HIGH"
+            }
+        return template
 
     def _init_database(self):
         """Initialize Guardian database."""
         try:
             with sqlite3.connect(self.config.db_path) as conn:
+                # journal_mode persists in the database file; set it before the schema
+                conn.execute(f"PRAGMA journal_mode={self.config.journal_mode}")
+                self._apply_pragmas(conn)
                 cursor = conn.cursor()
                 
                 # Health log table
@@ -634,6 +949,12 @@ class GuardianOrchestrator:
         except Exception as e:
             self.logger.error(f"Failed to initialize Guardian database: {e}")
     
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Apply the per-connection PRAGMAs for Guardian database connections."""
+        conn.execute(f"PRAGMA synchronous={self.config.synchronous}")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
     def _close_database_connections(self):
         """Close any open database connections."""
         try:
@@ -7,7 +7,7 @@ indicators.  Indicators are simple objects exposing an ``update`` method.
 
 from __future__ import annotations
 
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Mapping, Tuple
 import time
 
 from .indicators import (
@@ -23,8 +23,11 @@ MAX_INDICATORS_PER_SYMBOL = 50
 class IndicatorEngine:
     def __init__(self, ui_refresh_ms: int = 500):
         self.ui_refresh_ms = ui_refresh_ms
-        self._registry: Dict[str, List[object]] = {}
-        self._last_perf_check = time.time()
+        # symbol -> [(output name, indicator)]; names are bound once at registration
+        self._registry: Dict[str, List[Tuple[str, object]]] = {}
+        # Integer monotonic nanoseconds keep the per-update check to one compare
+        self._refresh_ns = int(ui_refresh_ms * 1_000_000)
+        self._last_perf_check_ns = time.monotonic_ns()
         # Track how many indicator updates occur between performance checks
         self._updates_since_perf = 0
         # Most recent performance metrics captured by :meth:`_maybe_perf_check`
@@ -35,27 +38,44 @@ class IndicatorEngine:
         lst = self._registry.setdefault(symbol, [])
         if len(lst) >= MAX_INDICATORS_PER_SYMBOL:
             raise ValueError("indicator cap exceeded")
-        lst.append(indicator)
+        lst.append((type(indicator).__name__, indicator))
 
     def update(self, symbol: str, value: float) -> Dict[str, float]:
-        outputs: Dict[str, float] = {}
+        outputs = self._update_symbol(symbol, value)
         self._updates_since_perf += 1
-        for ind in self._registry.get(symbol, []):
+        self._maybe_perf_check()
+        return outputs
+
+    def update_many(self, values: Mapping[str, float]) -> Dict[str, Dict[str, float]]:
+        """Update several symbols at once, e.g. a full strength snapshot.
+
+        Equivalent to calling :meth:`update` per symbol, but the throughput
+        bookkeeping runs once for the whole batch.
+        """
+        update_symbol = self._update_symbol
+        results = {symbol: update_symbol(symbol, value) for symbol, value in values.items()}
+        self._updates_since_perf += len(results)
+        self._maybe_perf_check()
+        return results
+
+    def _update_symbol(self, symbol: str, value: float) -> Dict[str, float]:
+        outputs: Dict[str, float] = {}
+        for name, ind in self._registry.get(symbol, ()):
             try:
                 out = ind.update(value)
             except Exception:
                 out = None
-            outputs[ind.__class__.__name__] = out if out is not None else float("nan")
-        self._maybe_perf_check()
+            outputs[name] = out if out is not None else float("nan")
         return outputs
 
     # ------------------------------------------------------------------
     def _maybe_perf_check(self) -> None:
-        now = time.time()
-        elapsed_ms = (now - self._last_perf_check) * 1000
-        if elapsed_ms >= self.ui_refresh_ms:
+        now = time.monotonic_ns()
+        elapsed_ns = now - self._last_perf_check_ns
+        if elapsed_ns >= self._refresh_ns:
             # Record simple throughput metrics.  This deliberately avoids
             # expensive operations to keep the engine lightweight.
+            elapsed_ms = elapsed_ns / 1_000_000
             if elapsed_ms:
                 rate = self._updates_since_perf / (elapsed_ms / 1000.0)
             else:
@@ -66,7 +86,7 @@ class IndicatorEngine:
                 "updates_per_sec": rate,
             }
             self._updates_since_perf = 0
-            self._last_perf_check = now
+            self._last_perf_check_ns = now
 
 
 # Factory convenience ----------------------------------------------------------
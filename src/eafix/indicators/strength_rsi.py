@@ -12,21 +12,26 @@ class StrengthRSIIndicator:
     def __init__(self, period: int = 14):
         self.period = period
         self.values: Deque[float] = deque(maxlen=period + 1)
+        # Per-step gains/losses of the window, kept alongside ``values`` so an
+        # update only computes the newest change instead of the whole window
+        self._gains: Deque[float] = deque(maxlen=period)
+        self._losses: Deque[float] = deque(maxlen=period)
         self.rsi: Optional[float] = None
 
     def update(self, value: float) -> float:
+        if self.values:
+            change = value - self.values[-1]
+            self._gains.append(change if change > 0 else 0.0)
+            self._losses.append(-change if change < 0 else 0.0)
         self.values.append(value)
         if len(self.values) <= 1:
             self.rsi = 0.0
-        elif len(self.values) >= self.period + 1:
-            gains = [max(0.0, self.values[i+1]-self.values[i]) for i in range(self.period)]
-            losses = [max(0.0, self.values[i]-self.values[i+1]) for i in range(self.period)]
-            avg_gain = sum(gains)/self.period
-            avg_loss = sum(losses)/self.period
+        elif len(self._gains) >= self.period:
+            avg_gain = sum(self._gains)/self.period
+            avg_loss = sum(self._losses)/self.period
             if avg_loss == 0:
                 self.rsi = 100.0
             else:
                 rs = avg_gain/avg_loss
                 self.rsi = 100 - (100/(1+rs))
         return self.rsi or 0.0
-
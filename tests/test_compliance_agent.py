@@ -0,0 +1,55 @@
+from eafix.guardian.agents import compliance_agent
+from eafix.guardian.agents.compliance_agent import ComplianceAgent, ComplianceStatus
+
+
+def test_resolved_violations_leave_the_active_list():
+    agent = ComplianceAgent()
+    assert agent.check_position_size("EURUSD", 200000.0) is ComplianceStatus.VIOLATION
+    assert agent.check_exposure(600000.0) is ComplianceStatus.VIOLATION
+    assert agent.check_daily_loss(-100.0) is ComplianceStatus.COMPLIANT
+
+    assert agent.resolve_violation(0)
+    assert [v.rule_name for v in agent.get_active_violations()] == ["max_exposure"]
+    assert not agent.resolve_violation(5)
+
+
+def test_violation_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(compliance_agent, "MAX_VIOLATIONS", 3)
+    agent = ComplianceAgent()
+    for size in range(200001, 200006):
+        agent.check_position_size("EURUSD", float(size))
+
+    assert [v.current_value for v in agent.violations] == [200003.0, 200004.0, 200005.0]
+    assert len(agent.get_active_violations()) == 3
+
+    assert [v.violation_id for v in agent.violations] == [2, 3, 4]
+    assert not agent.resolve_violation(1)
+    assert agent.resolve_violation(3)
+    assert [v.current_value for v in agent.get_active_violations()] == [200003.0, 200005.0]
+    assert agent.resolve_violation(3)  # Already resolved, still retained
+
+
+def test_daily_loss_compares_magnitude():
+    agent = ComplianceAgent()
+    assert agent.check_daily_loss(-6000.0) is ComplianceStatus.VIOLATION
+    violation = agent.get_active_violations()[0]
+    assert (violation.violation_type, violation.severity, violation.current_value) == (
+        "daily_loss_exceeded", "CRITICAL", 6000.0
+    )
+
+    agent.disable_rule("daily_loss_limit")
+    assert agent.check_daily_loss(-6000.0) is ComplianceStatus.COMPLIANT
+
+
+def test_log_messages_are_formatted_lazily(caplog):
+    agent = ComplianceAgent()
+    with caplog.at_level("INFO", logger=compliance_agent.__name__):
+        agent.check_position_size("EURUSD", 200000.0)
+        agent.check_exposure(600000.0)
+        agent.log("100% compliant")
+    assert [r.getMessage() for r in caplog.records] == [
+        "ComplianceAgent: Position size violation for EURUSD: 200000.0 > 100000.0",
+        "ComplianceAgent: Exposure limit violation: 600000.0 > 500000.0",
+        "ComplianceAgent: 100% compliant",
+    ]
+    assert caplog.records[0].args == ("Position size violation for", "EURUSD", 200000.0, 100000.0)
@@ -21,6 +21,16 @@ def test_state_helpers():
     assert state_none() == "NONE"
 
 
+def test_state_rsi_bucket_boundaries_and_custom_buckets():
+    assert state_rsi_bucket(0) == "RSI_0_30"
+    assert state_rsi_bucket(30) == "RSI_30_70"
+    assert state_rsi_bucket(70) == "RSI_70_100"
+    assert state_rsi_bucket(100) == "RSI_OUT_OF_RANGE"
+    assert state_rsi_bucket(-5) == "RSI_OUT_OF_RANGE"
+    assert state_rsi_bucket(float("nan")) == "RSI_OUT_OF_RANGE"
+    assert state_rsi_bucket(60, buckets=((0, 50), (50, 100))) == "RSI_50_100"
+
+
 def test_probability_helpers():
     assert pytest.approx(ConditionalScanner.laplace_smoothing(3, 4), rel=1e-3) == 2/3
     low, high = ConditionalScanner.wilson_score_interval(0.5, 10)
@@ -38,6 +48,23 @@ def test_best_match_and_pips():
     assert pips(0.0005, decimals=4) == 5.0
 
 
+def test_best_match_ties_and_updated_rows():
+    scanner = ConditionalScanner(ScanConfig())
+    rows = [
+        ConditionalRow("a", "o", "dir", "s", succ=6, tot=8, p=0.6),
+        ConditionalRow("b", "o", "dir", "s", succ=9, tot=12, p=0.6),
+        ConditionalRow("c", "o", "dir", "s", succ=9, tot=12, p=0.6),
+    ]
+    assert scanner.best_match(rows).trigger == "b"
+    assert scanner.best_match(rows).trigger == "b"
+    rows.append(ConditionalRow("d", "o", "dir", "s", succ=9, tot=10, p=0.7))
+    assert scanner.best_match(rows).trigger == "d"
+    rows[0] = ConditionalRow("e", "o", "dir", "s", succ=9, tot=10, p=0.8)
+    assert scanner.best_match(rows).trigger == "e"
+    rows[0].p = 0.1
+    assert scanner.best_match(rows).trigger == "d"
+
+
 def test_scan_writes_headers(tmp_path: Path):
     scanner = ConditionalScanner(ScanConfig(months_back=1))
     table_path = scanner.scan("EURUSD", tmp_path)
@@ -46,3 +73,139 @@ def test_scan_writes_headers(tmp_path: Path):
         reader = csv.reader(fh)
         header = next(reader)
     assert header == ["symbol","trigger","outcome","dir","state","succ","tot","p"]
+
+
+def test_scan_without_pandas_raises_clear_import_error(tmp_path: Path, monkeypatch):
+    from eafix import conditional_signals
+
+    monkeypatch.setattr(conditional_signals, "pd", None)
+    scanner = ConditionalScanner(ScanConfig(months_back=1))
+    with pytest.raises(ImportError, match="numpy and pandas"):
+        scanner.scan("EURUSD", tmp_path, historical_data=[{"close": 1.1}])
+    assert scanner.scan("EURUSD", tmp_path).exists()
+
+
+def _synthetic_bars(n=1500):
+    import random
+
+    rng = random.Random(7)
+    price, bars = 1.1, []
+    for i in range(n):
+        price += rng.gauss(0, 0.0003)
+        bars.append({
+            "timestamp": f"2024-01-01T{(i // 60) % 24:02d}:{i % 60:02d}:00",
+            "close": price,
+            "high": price + abs(rng.gauss(0, 0.0002)),
+            "low": price - abs(rng.gauss(0, 0.0002)),
+        })
+    return bars
+
+
+def test_analyze_matches_mask_counts():
+    pd = pytest.importorskip("pandas")
+    scanner = ConditionalScanner(ScanConfig(min_samples=50))
+    bars = _synthetic_bars()
+    rows = scanner._analyze_historical_data("EURUSD", bars)
+    assert rows
+
+    df = pd.DataFrame(bars)
+    states = scanner._generate_state_buckets(df.copy())
+    by_trigger = {}
+    for config in scanner._get_trigger_configs():
+        by_trigger.update(
+            (name, (mask, scanner._calculate_outcomes(df, config)))
+            for name, mask in scanner._calculate_triggers(df, config).items()
+        )
+    for row in rows[:25]:
+        trigger, outcomes = by_trigger[row.trigger]
+        combined = trigger & states[row.state]
+        assert isinstance(row.tot, int) and isinstance(row.succ, int)
+        assert row.tot == int(combined.sum())
+        assert row.succ == int((combined & outcomes[row.outcome]).sum())
+        assert row.p == pytest.approx(ConditionalScanner.laplace_smoothing(row.succ, row.tot))
+
+
+def test_rolling_std_matches_pandas():
+    pd = pytest.importorskip("pandas")
+    from eafix.conditional_signals import _rolling_std
+
+    close = pd.Series([bar["close"] for bar in _synthetic_bars(300)])
+    expected = close.rolling(20).std()
+    result = _rolling_std(close, 20)
+    assert result.isna().sum() == expected.isna().sum() == 19
+    assert result.dropna().to_numpy() == pytest.approx(expected.dropna().to_numpy(), rel=1e-6)
+
+
+def test_simple_rsi_matches_pandas_chain():
+    pd = pytest.importorskip("pandas")
+    from eafix.conditional_signals import _simple_rsi
+
+    close = pd.Series([bar["close"] for bar in _synthetic_bars(300)] + [1.2] * 20)
+    change = close.pct_change()
+    gain = change.where(change > 0, 0).rolling(14).mean()
+    loss = (-change.where(change < 0, 0)).rolling(14).mean()
+    expected = 100 - (100 / (1 + gain / loss))
+
+    result = _simple_rsi(close, 14)
+    assert result.isna().tolist() == expected.isna().tolist()
+    assert result.dropna().to_numpy() == pytest.approx(expected.dropna().to_numpy(), rel=1e-9)
+
+
+def test_analysis_is_memoized_on_data_content():
+    pytest.importorskip("pandas")
+    scanner = ConditionalScanner(ScanConfig(min_samples=50))
+    bars = _synthetic_bars(800)
+    first = scanner._analyze_historical_data("EURUSD", bars)
+    assert scanner._analyze_historical_data("EURUSD", [dict(b) for b in bars]) == first
+    assert len(scanner._cache) == 1
+
+    expected = first[0].p
+    first[0].p = 0.0
+    scanner._analyze_historical_data("EURUSD", bars)[1].p = 0.0
+    again = scanner._analyze_historical_data("EURUSD", bars)
+    assert again[0].p == expected and again[1].p != 0.0
+
+    bars[-1] = dict(bars[-1], close=bars[-1]["close"] + 0.01)
+    scanner._analyze_historical_data("EURUSD", bars)
+    assert len(scanner._cache) == 2
+
+
+def test_parallel_analysis_reuses_one_pool_and_matches_serial(monkeypatch):
+    pytest.importorskip("pandas")
+    from eafix import conditional_signals
+
+    bars = _synthetic_bars(800)
+    serial = ConditionalScanner(ScanConfig(min_samples=50))._analyze_historical_data("EURUSD", bars)
+
+    monkeypatch.setattr(conditional_signals, "_PARALLEL_MIN_BARS", 0)
+    monkeypatch.setattr(conditional_signals.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(conditional_signals, "_analysis_pool", None)
+    scanner = ConditionalScanner(ScanConfig(min_samples=50))
+    assert scanner._analyze_historical_data("EURUSD", bars) == serial
+    pool = conditional_signals._analysis_pool
+    assert pool is not None
+
+    scanner._cache.clear()
+    assert scanner._analyze_historical_data("EURUSD", bars) == serial
+    assert conditional_signals._analysis_pool is pool
+    pool.shutdown()
+
+
+def test_rsi_state_masks_keep_boundaries():
+    pd = pytest.importorskip("pandas")
+    rsi = pd.Series([0.0, 30.0, 30.5, 69.9, 70.0, 100.0, float("nan")])
+    df = pd.DataFrame({"close": [1.1 + i * 1e-4 for i in range(len(rsi))], "rsi": rsi})
+    states = ConditionalScanner(ScanConfig())._generate_state_buckets(df)
+    assert list(states["RSI_0_30"]) == list(rsi <= 30)
+    assert list(states["RSI_30_70"]) == list((rsi > 30) & (rsi < 70))
+    assert list(states["RSI_70_100"]) == list(rsi >= 70)
+
+
+def test_quantiles_match_pandas():
+    pd = pytest.importorskip("pandas")
+    from eafix.conditional_signals import _quantiles
+
+    for n in (20, 21, 57, 1000):
+        series = pd.Series([bar["close"] for bar in _synthetic_bars(n)])
+        series.iloc[:5] = float("nan")
+        assert _quantiles(series.to_numpy(), (0.33, 0.67)) == (series.quantile(0.33), series.quantile(0.67))
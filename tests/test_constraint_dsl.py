@@ -0,0 +1,50 @@
+from eafix.guardian.constraints import dsl
+
+
+def test_evaluate_reuses_compiled_expression():
+    dsl._compile.cache_clear()
+    assert dsl.evaluate("x > 5 and y < 3", {"x": 6, "y": 1})
+    assert not dsl.evaluate("x > 5 and y < 3", {"x": 4, "y": 1})
+    assert dsl._compile.cache_info().hits == 1
+
+
+def test_evaluate_returns_false_on_errors():
+    assert not dsl.evaluate("x >", {"x": 1})
+    assert not dsl.evaluate("missing > 1", {})
+
+
+def test_evaluate_rejects_syntax_outside_the_grammar():
+    assert dsl.evaluate("-x + 2 ** 2 >= 3 and state in ('OK', 'WARN')", {"x": 1, "state": "OK"})
+    assert not dsl.evaluate("__import__('os').getcwd()", {})
+    assert not dsl.evaluate("x.real > 0", {"x": 1})
+    assert not dsl.evaluate("len(x) > 0", {"x": [1], "len": len})
+
+
+def test_boolean_operators_short_circuit():
+    # The right-hand operand names a missing key; evaluating it would fail
+    assert dsl.evaluate("ready or missing > 1", {"ready": True})
+    assert not dsl.evaluate("ready and missing > 1", {"ready": False})
+    assert dsl.evaluate("not (ready and missing > 1)", {"ready": False})
+
+
+def test_single_comparisons_skip_eval():
+    fast, code = dsl._compile("price < limit")
+    assert fast is not None and code is None
+    assert dsl.evaluate("price < limit", {"price": 1.1, "limit": 1.2})
+    assert dsl.evaluate("state != 'HALTED'", {"state": "OK"})
+    assert not dsl.evaluate("price < limit", {"price": 1.1})
+    assert dsl._compile("state in ('OK',)")[0] is None
+
+
+def test_oversized_powers_and_repetitions_are_rejected_quickly():
+    import time
+
+    start = time.monotonic()
+    assert not dsl.evaluate("9 ** 9 ** 9 > 0", {})
+    assert not dsl.evaluate("'a' * 10 ** 10 == ''", {})
+    assert not dsl.evaluate("s * n == ''", {"s": "ab", "n": 10 ** 10})
+    assert not dsl.evaluate("x ** n > 0", {"x": 3, "n": 10 ** 9})
+    assert time.monotonic() - start < 1.0
+
+    assert dsl.evaluate("x ** 3 == 27 and s * 2 == 'abab' and 2.0 ** 0.5 > 1", {"x": 3, "s": "ab"})
+    assert not dsl.evaluate("x * 2 == 4", {"x": 2, "__dsl_mul__": lambda a, b: 4})
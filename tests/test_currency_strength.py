@@ -1,4 +1,6 @@
-from eafix.currency_strength import calc_currency_strength
+import pytest
+
+from eafix.currency_strength import calc_currency_strength, zscore
 
 
 def test_calc_currency_strength():
@@ -7,3 +9,27 @@ def test_calc_currency_strength():
     assert strength["EUR"] == 1.0
     assert strength["USD"] == -1.5
     assert strength["JPY"] == 0.5
+
+
+def test_calc_currency_strength_skips_invalid_pairs_across_calls():
+    changes = {"EURUSD": 0.5, "GBPUSD": 0.25, "XAU": 9.0}
+    for _ in range(2):
+        strength = calc_currency_strength(changes)
+        assert set(strength) == {"EUR", "GBP", "USD"}
+        assert strength["USD"] == -0.75
+
+
+def test_zscore_single_pass_over_iterator():
+    assert zscore(iter([1.0, 2.0, 3.0, 4.0])) == pytest.approx(1.3416, rel=1e-3)
+    assert zscore(iter([2.0, 2.0, 2.0])) == 0.0
+    assert zscore([]) == 0.0
+
+
+def test_currency_vocabulary_is_per_basket():
+    import eafix.currency_strength as currency_strength
+
+    calc_currency_strength({f"Q{a}{b}USD": 1.0 for a in "ABCDEFGH" for b in "ABCDEFGH"})
+    names, base_idx, quote_idx, keep = currency_strength._compiled_pairs(("EURUSD", "XAU", "USDJPY"))
+    assert names == ("EUR", "USD", "JPY")
+    assert (base_idx, quote_idx, keep) == ((0, 1), (1, 2), (0, 2))
+    assert calc_currency_strength({"EURUSD": 1.0, "USDJPY": -0.5}) == {"EUR": 1.0, "USD": -1.5, "JPY": 0.5}
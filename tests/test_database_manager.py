@@ -0,0 +1,451 @@
+import math
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from eafix.conditional_signals import ConditionalRow
+from eafix.database_manager import DatabaseConfig, DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    manager = DatabaseManager(DatabaseConfig(db_path=str(tmp_path / "trading.db")))
+    yield manager
+    manager.shutdown()
+
+
+def test_store_tick_data_batch_single_transaction(db):
+    now = datetime.now()
+    ticks = [(1.1 + i * 1e-5, 1.1002 + i * 1e-5, now - timedelta(seconds=i)) for i in range(250)]
+    assert db.store_tick_data_batch("EURUSD", ticks)
+    assert db.store_tick_data("EURUSD", 1.2, 1.2002)
+
+    stored = db.get_historical_ticks("EURUSD", hours_back=1)
+    assert len(stored) == 251
+    assert stored[0]["bid"] == 1.2
+    assert stored[1]["spread"] == pytest.approx(0.0002)
+
+
+def test_database_wide_pragmas_applied_once(db):
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.isolation_level == ""
+
+
+def test_top_probability_query_uses_covering_index(db):
+    with db.get_connection() as conn:
+        plan = " ".join(row[-1] for row in conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT trigger_type, outcome, direction, state, successes, total, probability
+            FROM probability_tables
+            WHERE symbol = ?
+            ORDER BY probability DESC, total DESC
+            LIMIT ?
+        """, ("EURUSD", 200)))
+    assert "COVERING INDEX idx_prob_cover" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def _rows(n):
+    return [
+        ConditionalRow(f"t{i}", "fwd_up_5_15", "BUY", "NONE", succ=i, tot=300 + i % 7, p=(i * 37 % 101) / 101)
+        for i in range(n)
+    ]
+
+
+def test_top_probabilities_served_from_materialized_table(db):
+    rows = _rows(260)
+    assert db.store_probability_table("EURUSD", rows)
+    expected = sorted(rows, key=lambda r: (r.p, r.tot), reverse=True)
+
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM probability_top").fetchone()[0] == 200
+
+    top = db.get_top_probabilities("EURUSD", limit=50)
+    assert [(r.p, r.tot) for r in top] == [(r.p, r.tot) for r in expected[:50]]
+    wide = db.get_top_probabilities("EURUSD", limit=250)
+    assert [(r.p, r.tot) for r in wide] == [(r.p, r.tot) for r in expected[:250]]
+
+    assert db.store_probability_table("EURUSD", rows[:3])
+    assert len(db.get_top_probabilities("EURUSD")) == 3
+
+
+def test_legacy_tables_migrated(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE tick_data (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL, bid REAL NOT NULL, ask REAL NOT NULL,
+            spread REAL NOT NULL, timestamp TEXT NOT NULL
+        )
+    """)
+    stamp = datetime.now().isoformat()
+    legacy.executemany(
+        "INSERT INTO tick_data (symbol, bid, ask, spread, timestamp) VALUES (?, ?, ?, ?, ?)",
+        [("EURUSD", 1.1, 1.1002, 0.0002, stamp), ("GBPUSD", 1.3, 1.3003, 0.0003, stamp),
+         ("GBPUSD", 1.31, 1.3103, 0.0003, stamp)],
+    )
+    legacy.execute("""
+        CREATE TABLE performance_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            metric_name TEXT NOT NULL, value REAL NOT NULL,
+            context TEXT, timestamp TEXT NOT NULL
+        )
+    """)
+    legacy.execute(
+        "INSERT INTO performance_log (metric_name, value, context, timestamp) VALUES (?, ?, ?, ?)",
+        ("latency", 1.5, "{}", stamp),
+    )
+    legacy.execute("""
+        CREATE TABLE system_config (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL, config_data TEXT NOT NULL, updated_at INTEGER NOT NULL
+        )
+    """)
+    legacy.execute("INSERT INTO system_config (name, config_data, updated_at) VALUES ('risk', '{\"max\": 2}', 0)")
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    manager = DatabaseManager(DatabaseConfig(db_path=str(path)))
+    try:
+        with manager.get_connection() as conn:
+            ddl = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'tick_data'").fetchone()[0]
+            stored_type = conn.execute("SELECT DISTINCT typeof(timestamp) FROM performance_log").fetchall()
+            schemas = [row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table'")]
+            sequences = conn.execute("SELECT COUNT(*) FROM sqlite_sequence").fetchone()[0]
+        assert "WITHOUT ROWID" in ddl
+        assert not any("AUTOINCREMENT" in sql for sql in schemas)
+        assert sequences == 0
+        assert manager.get_system_config("risk") == {"max": 2}
+        assert stored_type == [("integer",)]
+        ticks = manager.get_historical_ticks("GBPUSD", hours_back=1)
+        assert [(t["bid"], t["timestamp"]) for t in ticks] == [(1.31, stamp), (1.3, stamp)]
+        assert [m["timestamp"] for m in manager.get_performance_metrics("latency")] == [stamp]
+    finally:
+        manager.shutdown()
+
+
+def test_performance_context_symbol_is_generated_column(db):
+    assert db.log_performance_metric("latency", 2.0, {"symbol": "EURUSD", "n": 3})
+    assert db.log_performance_metric("latency", 3.0, {"symbol": "GBPUSD"})
+    with db.get_connection() as conn:
+        rows = conn.execute(
+            "SELECT value FROM performance_log WHERE ctx_symbol = ?", ("EURUSD",)
+        ).fetchall()
+    assert rows == [(2.0,)]
+    metrics = db.get_performance_metrics("latency")
+    assert {m["context"]["symbol"] for m in metrics} == {"EURUSD", "GBPUSD"}
+
+
+def test_store_tick_data_is_queued_and_flushed_before_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    config = DatabaseConfig(db_path=str(tmp_path / "ticks.db"), tick_flush_interval_ms=60_000)
+    manager = DatabaseManager(config)
+    now = datetime.now()
+    for i in range(50):
+        assert manager.store_tick_data("EURUSD", 1.1, 1.1002, now - timedelta(seconds=i))
+    assert len(manager.get_historical_ticks("EURUSD", hours_back=1)) == 50
+
+    manager.store_tick_data("GBPUSD", 1.3, 1.3003, now)
+    manager.shutdown()
+
+    reopened = DatabaseManager(config)
+    try:
+        assert len(reopened.get_historical_ticks("GBPUSD", hours_back=1)) == 1
+    finally:
+        reopened.shutdown()
+
+
+def test_failed_tick_batches_are_reported_by_flush(db, monkeypatch):
+    monkeypatch.setattr(db, "_write_tick_rows", lambda rows, symbol: False)
+    db.store_tick_data("EURUSD", 1.1, 1.1002)
+    assert db.flush_ticks() is False
+    assert db._ticks_written == 0
+    monkeypatch.undo()
+
+    db.store_tick_data("EURUSD", 1.1, 1.1002)
+    assert db.flush_ticks() is True
+    assert len(db.get_historical_ticks("EURUSD", hours_back=1)) == 1
+
+
+def test_queued_ticks_flushed_when_manager_is_collected(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    config = DatabaseConfig(db_path=str(tmp_path / "del.db"), tick_flush_interval_ms=60_000)
+    manager = DatabaseManager(config)
+    manager.store_tick_data("EURUSD", 1.1, 1.1002)
+    manager.__del__()
+    assert manager.store_tick_data("EURUSD", 1.1, 1.1002) is False
+
+    reopened = DatabaseManager(config)
+    try:
+        assert len(reopened.get_historical_ticks("EURUSD", hours_back=1)) == 1
+    finally:
+        reopened.shutdown()
+
+
+def test_shutdown_runs_pragma_optimize(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    manager = DatabaseManager(DatabaseConfig(db_path=str(tmp_path / "opt.db")))
+    statements = []
+    with manager.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    manager.shutdown()
+    assert "PRAGMA optimize" in statements
+
+
+def test_reads_use_query_only_pool_while_writer_is_busy(db):
+    with db.get_connection() as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute(
+            "INSERT INTO system_config (name, config_data, updated_at) VALUES ('x', '{}', 0)"
+        )
+        # The writer slot is taken and holds the write lock; reads still proceed
+        assert db.get_system_config("missing") is None
+        with db.get_connection(readonly=True) as reader:
+            with pytest.raises(sqlite3.OperationalError):
+                reader.execute("DELETE FROM system_config")
+
+
+def test_nested_writer_use_on_one_thread_reuses_the_connection(db):
+    db.config.connection_timeout = 0.5
+    with db.get_connection() as outer:
+        with db.get_connection() as inner:
+            assert inner is outer
+        assert db.store_system_config("nested", {"ok": True})
+    assert db.get_system_config("nested") == {"ok": True}
+
+
+def test_nested_writer_inside_open_transaction_fails_without_touching_it(db):
+    with db.get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO system_config (name, config_data, updated_at) VALUES ('outer', '{}', 0)")
+        assert not db.store_system_config("inner", {"ok": True})
+        assert conn.in_transaction
+        conn.commit()
+    assert db.get_system_config("outer") == {}
+    assert db.get_system_config("inner") is None
+
+
+def test_reads_on_the_writer_thread_leave_queued_ticks_to_the_flusher(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    config = DatabaseConfig(db_path=str(tmp_path / "defer.db"), tick_flush_interval_ms=20)
+    manager = DatabaseManager(config)
+    try:
+        assert manager.store_tick_data("EURUSD", 1.1, 1.1002)
+        with manager.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            assert manager.flush_ticks()
+            manager.get_historical_ticks("EURUSD", hours_back=1)
+            conn.commit()
+        assert manager.flush_ticks()
+        assert manager._ticks_failed == 0
+        assert len(manager.get_historical_ticks("EURUSD", hours_back=1)) == 1
+    finally:
+        manager.shutdown()
+
+
+def test_iter_historical_ticks_yields_rows_lazily(db):
+    now = datetime.now()
+    db.store_tick_data_batch("EURUSD", [(1.1, 1.1003, now - timedelta(seconds=i)) for i in range(5)])
+
+    rows = db.iter_historical_ticks("EURUSD", hours_back=1, limit=3)
+    first = next(rows)
+    assert first["spread"] == pytest.approx(0.0003)
+    assert isinstance(first["timestamp"], int)
+    assert len(list(rows)) == 2
+
+
+def test_query_stats_are_derived_from_counters(db):
+    db._update_query_stats(0.002)
+    db._update_query_stats(0.004)
+    db._update_query_stats(db.config.performance_target_ms / 1000 * 2)
+
+    stats = db.get_database_stats()["query_stats"]
+    assert stats["total_queries"] >= 3
+    assert stats["slow_queries"] >= 1
+    assert stats["avg_query_time_ms"] > 0
+    assert stats["last_query_time"] is not None
+
+
+def test_cleanup_range_scans_retention_indexes(db):
+    old = datetime.now() - timedelta(days=db.config.tick_data_retention_days + 1)
+    db.store_tick_data_batch("EURUSD", [(1.1, 1.1002, old), (1.1, 1.1002, datetime.now())])
+    with db.get_connection() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM tick_data WHERE timestamp < 0"
+        ))
+    assert "idx_tick_time" in plan
+
+    assert db.cleanup_old_data()
+    assert len(db.get_historical_ticks("EURUSD", hours_back=24 * 30)) == 1
+
+
+def test_performance_metrics_filter_by_context_in_sql(db):
+    db.log_performance_metric("fill", 1.0, {"symbol": "EURUSD", "venue": "a"})
+    db.log_performance_metric("fill", 2.0, {"symbol": "EURUSD", "venue": "b"})
+    db.log_performance_metric("fill", 3.0, {"symbol": "GBPUSD", "venue": "a"})
+    db.log_performance_metric("fill", 4.0)
+
+    metrics = db.get_performance_metrics("fill", context_filter={"symbol": "EURUSD", "venue": "a"})
+    assert [m["value"] for m in metrics] == [1.0]
+    assert metrics[0]["context"] == {"symbol": "EURUSD", "venue": "a"}
+    contexts = [m["context"] for m in db.get_performance_metrics("fill")]
+    assert all(type(context) is dict for context in contexts)
+    assert len(contexts) == 4 and {} in contexts
+
+
+def test_returned_writer_rolls_back_only_open_transactions(db):
+    statements = []
+    with db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        conn.execute("SELECT 1")
+    assert "ROLLBACK" not in statements
+
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO system_config (name, config_data, updated_at) VALUES ('x', '{}', 0)")
+    assert "ROLLBACK" in statements
+    assert db.get_system_config("x") is None
+    with db.get_connection() as conn:
+        conn.set_trace_callback(None)
+
+
+def test_shutdown_wakes_maintenance_thread(tmp_path):
+    manager = DatabaseManager(DatabaseConfig(db_path=str(tmp_path / "maint.db")))
+    thread = manager._maintenance_thread
+    manager.shutdown()
+    assert not thread.is_alive()
+
+
+def test_unknown_probability_symbols_skip_the_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    config = DatabaseConfig(db_path=str(tmp_path / "known.db"))
+    manager = DatabaseManager(config)
+    assert manager.store_probability_table(
+        "EURUSD", [ConditionalRow("t", "o", "BUY", "s", 300, 500, 0.6)]
+    )
+    manager.shutdown()
+
+    reopened = DatabaseManager(config)
+    try:
+        assert reopened._known_prob_symbols == {"EURUSD"}
+        assert len(reopened.get_top_probabilities("EURUSD")) == 1
+
+        def no_connection(readonly=False):
+            raise AssertionError("unknown symbol reached the database")
+
+        monkeypatch.setattr(reopened, "get_connection", no_connection)
+        assert reopened.get_probability_table("USDJPY") == []
+        assert reopened.get_top_probabilities("USDJPY") == []
+    finally:
+        monkeypatch.undo()
+        reopened.shutdown()
+
+
+def test_probability_tables_stored_elsewhere_are_found_after_recheck(tmp_path, monkeypatch):
+    import eafix.database_manager as database_manager
+
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    config = DatabaseConfig(db_path=str(tmp_path / "shared.db"))
+    reader = DatabaseManager(config)
+    writer = DatabaseManager(config)
+    try:
+        assert reader.get_top_probabilities("EURUSD") == []
+        assert writer.store_probability_table(
+            "EURUSD", [ConditionalRow("t", "o", "BUY", "s", 300, 500, 0.6)]
+        )
+        assert reader.get_top_probabilities("EURUSD") == []  # Miss still fresh
+
+        monkeypatch.setattr(database_manager, "PROBABILITY_SYMBOL_RECHECK_SECONDS", 0.0)
+        assert len(reader.get_top_probabilities("EURUSD")) == 1
+        assert "EURUSD" in reader._known_prob_symbols
+        assert reader.get_probability_table("USDJPY") == []
+        assert "USDJPY" in reader._prob_symbols_checked
+
+        monkeypatch.setattr(database_manager, "PROBABILITY_SYMBOL_CHECKS_MAX", 3)
+        for symbol in ("AUDUSD", "NZDUSD", "USDCAD", "USDCHF"):
+            reader.get_top_probabilities(symbol)
+        assert list(reader._prob_symbols_checked) == ["NZDUSD", "USDCAD", "USDCHF"]
+        assert reader.store_probability_table("USDCHF", [ConditionalRow("t", "o", "BUY", "s", 300, 500, 0.6)])
+        assert "USDCHF" not in reader._prob_symbols_checked
+    finally:
+        writer.shutdown()
+        reader.shutdown()
+
+
+def test_ticks_sharing_a_timestamp_are_all_kept(db):
+    stamp = datetime.now().replace(microsecond=0)
+    assert db.store_tick_data_batch("EURUSD", [(1.1, 1.1002, stamp), (1.2, 1.2002, stamp)])
+    db.store_tick_data("EURUSD", 1.3, 1.3002, stamp)
+    assert [t["bid"] for t in db.get_historical_ticks("EURUSD", hours_back=1)] == [1.3, 1.2, 1.1]
+
+
+def test_tick_table_without_seq_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / "clustered.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE tick_data (
+            symbol TEXT NOT NULL, bid REAL NOT NULL, ask REAL NOT NULL,
+            spread REAL NOT NULL, timestamp INTEGER NOT NULL,
+            PRIMARY KEY (symbol, timestamp)
+        ) WITHOUT ROWID
+    """)
+    stamp = datetime.now().replace(microsecond=0)
+    legacy.execute(
+        "INSERT INTO tick_data VALUES ('EURUSD', 1.1, 1.1002, 0.0002, ?)", (int(stamp.timestamp()) * 1_000_000,)
+    )
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    manager = DatabaseManager(DatabaseConfig(db_path=str(path)))
+    try:
+        manager.store_tick_data("EURUSD", 1.2, 1.2002, stamp)
+        assert [t["bid"] for t in manager.get_historical_ticks("EURUSD", hours_back=1)] == [1.2, 1.1]
+    finally:
+        manager.shutdown()
+
+
+def test_performance_context_accepts_numpy_scalars_and_nan(db):
+    np = pytest.importorskip("numpy")
+    assert db.log_performance_metric(
+        "latency", 1.0, {"symbol": "EURUSD", "mean": np.float64(1.5), "count": np.int64(3), "gap": float("nan")}
+    )
+    context = db.get_performance_metrics("latency")[0]["context"]
+    assert (context["mean"], context["count"]) == (1.5, 3)
+    assert math.isnan(context["gap"])
+    assert db.get_performance_metrics("latency", context_filter={"symbol": "EURUSD"}) == []
+    assert db.get_performance_metrics("latency", context_filter={"mean": 1.5}) == []
+
+
+def test_unguarded_context_symbol_column_is_rebuilt(tmp_path, monkeypatch):
+    path = tmp_path / "perf.db"
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE performance_log (
+            id INTEGER PRIMARY KEY, metric_name TEXT NOT NULL, value REAL NOT NULL,
+            context TEXT, timestamp INTEGER NOT NULL,
+            ctx_symbol TEXT GENERATED ALWAYS AS (json_extract(context, '$.symbol')) VIRTUAL
+        )
+    """)
+    legacy.execute("CREATE INDEX idx_perf_ctx_symbol ON performance_log (ctx_symbol, timestamp)")
+    legacy.execute(
+        "INSERT INTO performance_log (metric_name, value, context, timestamp) VALUES (?, ?, ?, ?)",
+        ("latency", 1.0, '{"symbol": "EURUSD"}', int(datetime.now().timestamp()) * 1_000_000),
+    )
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setattr(DatabaseManager, "_start_maintenance", lambda self: None)
+    manager = DatabaseManager(DatabaseConfig(db_path=str(path)))
+    try:
+        assert manager.log_performance_metric("latency", 2.0, {"symbol": "EURUSD", "gap": float("inf")})
+        assert [m["value"] for m in manager.get_performance_metrics("latency", context_filter={"symbol": "EURUSD"})] == [1.0]
+        assert len(manager.get_performance_metrics("latency")) == 2
+    finally:
+        manager.shutdown()
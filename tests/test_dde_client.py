@@ -0,0 +1,215 @@
+from datetime import datetime
+
+import pytest
+
+from eafix.dde_client import DDEClient, DDEConfig, _parse_server_time
+
+
+def _client(buffer_size=4):
+    return DDEClient(DDEConfig(buffer_size=buffer_size, symbols=["EURUSD"]))
+
+
+def test_ring_keeps_newest_ticks_in_order():
+    client = _client()
+    base = datetime(2024, 1, 2, 3, 4, 5).timestamp()
+    for i in range(6):
+        client.push_tick("EURUSD", 1.1 + i / 1000, 1.1002 + i / 1000, base + i)
+
+    history = client.get_tick_history("EURUSD", count=10)
+    assert [round(t.bid, 4) for t in history] == [1.102, 1.103, 1.104, 1.105]
+    assert history[-1].timestamp == datetime.fromtimestamp(base + 5)
+    assert client.get_latest_tick("EURUSD").bid == history[-1].bid
+    assert client.get_tick_history("EURUSD", count=2) == history[-2:]
+    assert client.get_connection_status()["buffer_stats"] == {"EURUSD": 4}
+
+
+def test_tick_columns_unwrap_the_ring():
+    client = _client()
+    for i in range(5):
+        client.push_tick("EURUSD", float(i), float(i) + 0.5)
+
+    columns = client.get_tick_columns("EURUSD", count=3)
+    assert list(columns["bid"]) == [2.0, 3.0, 4.0]
+    assert list(columns["ask"]) == [2.5, 3.5, 4.5]
+    assert list(client.get_tick_columns("EURUSD", count=10)["bid"]) == [1.0, 2.0, 3.0, 4.0]
+    assert len(client.get_tick_columns("GBPUSD")["bid"]) == 0
+    assert client.get_latest_tick("GBPUSD") is None
+    assert client.get_tick_history("GBPUSD") == []
+
+
+def test_ring_storage_is_power_of_two_but_history_respects_buffer_size():
+    client = _client(buffer_size=5)
+    for i in range(12):
+        client.push_tick("EURUSD", float(i), float(i) + 0.5)
+
+    ring = client._buffers["EURUSD"]
+    assert ring.mask == 7
+    assert [t.bid for t in client.get_tick_history("EURUSD", count=100)] == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert list(client.get_tick_columns("EURUSD", count=100)["bid"]) == [7.0, 8.0, 9.0, 10.0, 11.0]
+
+
+def test_poll_emits_only_changed_quotes():
+    class Conversation:
+        def __init__(self):
+            self.quotes = {"EURUSD_BID": "1.1000", "EURUSD_ASK": "1.1002", "EURUSD_TIME": "2024.01.02 03:04:05"}
+            self.requests = []
+
+        def Request(self, item):
+            self.requests.append(item)
+            return self.quotes[item]
+
+    client = _client()
+    client.connection_handle = conversation = Conversation()
+    client._connected_topics.update(conversation.quotes)
+
+    client._poll_all_symbols()
+    client._poll_all_symbols()
+    conversation.quotes["EURUSD_ASK"] = "1.1003"
+    client._poll_all_symbols()
+
+    conversation.quotes["EURUSD_BID"] = "bad"
+    client._poll_all_symbols()
+    client._poll_all_symbols()
+
+    history = client.get_tick_history("EURUSD")
+    assert [t.ask for t in history] == [1.1002, 1.1003]
+    assert history[0].server_time == datetime(2024, 1, 2, 3, 4, 5)
+    assert conversation.requests.count("EURUSD_TIME") == 2
+    assert client._last_quotes["EURUSD"] == ("1.1000", "1.1003")
+
+    client.unsubscribe("EURUSD")
+    assert "EURUSD" not in client._last_quotes
+    client.subscribe("EURUSD")
+    conversation.quotes["EURUSD_BID"] = "1.1000"
+    client._poll_all_symbols()
+    assert [t.ask for t in client.get_tick_history("EURUSD")] == [1.1003]
+
+
+def test_parse_server_time_matches_strptime():
+    for text in ("2024.01.02 03:04:05", "1999.12.31 23:59:59", "2024.1.2 3:04:05"):
+        assert _parse_server_time(text) == datetime.strptime(text, "%Y.%m.%d %H:%M:%S")
+    for text in ("2024.13.02 03:04:05", "2024.01.02 0x:04:05", ""):
+        with pytest.raises(ValueError):
+            _parse_server_time(text)
+
+
+def test_polling_loop_keeps_a_fixed_cadence(monkeypatch):
+    import eafix.dde_client as dde_client
+
+    client = _client()
+    client.config.poll_interval_ms = 100
+    clock = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(round(seconds, 6))
+        clock[0] += seconds
+        if len(sleeps) == 3:
+            client._polling_active = False
+
+    def slow_poll():
+        clock[0] += 0.03
+
+    monkeypatch.setattr(dde_client.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(dde_client.time, "sleep", fake_sleep)
+    monkeypatch.setattr(client, "_poll_all_symbols", slow_poll)
+    client.state = dde_client.DDEConnectionState.CONNECTED
+    client.connection_handle = object()
+    client._polling_active = True
+
+    client._polling_loop()
+    assert sleeps == [0.07, 0.07, 0.07]
+
+
+def test_status_counts_are_derived_from_rings():
+    client = _client()
+    client.subscribe("GBPUSD")
+    for i in range(6):
+        client.push_tick("EURUSD", 1.1, 1.1002)
+    client.push_tick("USDJPY", 150.0, 150.02)
+
+    status = client.get_connection_status()
+    assert status["ticks_received"] == 7
+    assert status["symbols_active"] == 2
+
+    client.unsubscribe("USDJPY")
+    status = client.get_connection_status()
+    assert status["ticks_received"] == 7
+    assert status["symbols_active"] == 1
+
+
+def test_bulk_callbacks_receive_column_batches():
+    client = _client(buffer_size=16)
+    client.config.bulk_batch_size = 3
+    batches = []
+    client.add_bulk_tick_callback(lambda symbol, columns: batches.append((symbol, list(columns["bid"]))))
+    seen = []
+    client.add_tick_callback(seen.append)
+
+    for i in range(7):
+        client.push_tick("EURUSD", float(i), float(i) + 0.5)
+    assert batches == [("EURUSD", [0.0, 1.0, 2.0]), ("EURUSD", [3.0, 4.0, 5.0])]
+
+    client.flush_bulk_callbacks()
+    assert batches[-1] == ("EURUSD", [6.0])
+    assert len(seen) == 7
+
+    client.remove_tick_callback(seen.append)
+    client.remove_bulk_tick_callback(client._bulk_callbacks[0])
+    client.push_tick("EURUSD", 9.0, 9.5)
+    assert len(seen) == 7 and client._bulk_callbacks == ()
+
+
+def test_ticks_without_callbacks_skip_tick_objects(monkeypatch):
+    import eafix.dde_client as dde_client
+
+    if dde_client._SLOTS:
+        assert not hasattr(dde_client.TickData(1, 1, 1, 0, datetime.now()), "__dict__")
+    client = _client()
+
+    def no_tick(*args, **kwargs):
+        raise AssertionError("TickData built without subscribers")
+
+    monkeypatch.setattr(dde_client, "TickData", no_tick)
+    client.push_tick("EURUSD", 1.1, 1.1002)
+    monkeypatch.undo()
+
+    assert client.get_latest_tick("EURUSD").ask == 1.1002
+    assert client.get_connection_status()["last_tick_time"] is not None
+
+
+
+def test_push_tick_is_serialized_with_the_polling_producer():
+    import threading
+
+    client = _client()
+    client.push_tick("EURUSD", 1.1, 1.1002)
+    pusher = threading.Thread(target=client.push_tick, args=("EURUSD", 1.2, 1.2002))
+
+    with client._producer_lock:  # Held by the polling thread while it stores ticks
+        pusher.start()
+        pusher.join(timeout=0.1)
+        assert pusher.is_alive()
+        assert client._buffers["EURUSD"].head == 1
+    pusher.join(timeout=5)
+    assert [t.bid for t in client.get_tick_history("EURUSD")] == [1.1, 1.2]
+
+
+def test_callbacks_run_outside_the_producer_lock():
+    import threading
+
+    client = _client()
+    pushed = []
+
+    def on_tick(tick):
+        if tick.symbol == "EURUSD":
+            # A callback waiting on another producer must not deadlock
+            pusher = threading.Thread(target=client.push_tick, args=("GBPUSD", 1.3, 1.3002))
+            pusher.start()
+            pusher.join(timeout=2)
+            pushed.append(not pusher.is_alive())
+
+    client.add_tick_callback(on_tick)
+    client.push_tick("EURUSD", 1.1, 1.1002)
+    assert pushed == [True]
+    assert client._buffers["GBPUSD"].head == 1
@@ -57,6 +57,8 @@ def test_fetch_event_result_polls_until_actual(monkeypatch):
     responses = [html_no_actual, html_with_actual]
 
     class DummyResp:
+        headers = {}
+
         def __init__(self, html):
             self.html = html
 
@@ -82,3 +84,95 @@ def test_fetch_event_result_polls_until_actual(monkeypatch):
     result = fetch_event_result("http://example.com", delay_range=(0, 0), poll_interval=0, max_attempts=2)
     assert result.actual == 1.5
     assert "\a" in beeps
+
+
+def test_parse_event_page_takes_first_cell_of_each_class_in_any_order():
+    html = """
+    <td class='Previous'><span>1,000.5</span></td>
+    <td class="actual">n/a</td>
+    <td class="forecast">-0.2%</td>
+    <td class="actual">9.9</td>
+    """
+    result = parse_event_page(html)
+    assert result.actual is None
+    assert result.forecast == -0.2
+    assert result.previous == 1000.5
+    assert result.diff_forecast is None
+
+
+def test_fetch_event_result_reuses_result_on_not_modified(monkeypatch):
+    from urllib.error import HTTPError
+
+    html_no_actual = '<td class="actual"></td><td class="forecast">1.2%</td>'
+    html_with_actual = '<td class="actual">1.5%</td><td class="forecast">1.2%</td>'
+    sent_headers = []
+
+    class DummyResp:
+        def __init__(self, html, etag):
+            self.html = html
+            self.headers = {"ETag": etag}
+
+        def read(self):
+            return self.html.encode("utf-8")
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            pass
+
+    def fake_urlopen(request, timeout=10):
+        sent_headers.append(request.get_header("If-none-match"))
+        if len(sent_headers) == 1:
+            return DummyResp(html_no_actual, '"v1"')
+        if len(sent_headers) == 2:
+            raise HTTPError(request.full_url, 304, "Not Modified", {}, None)
+        return DummyResp(html_with_actual, '"v2"')
+
+    monkeypatch.setattr(economic_calendar, "urlopen", fake_urlopen)
+    monkeypatch.setattr(economic_calendar.random, "randint", lambda a, b: 0)
+    monkeypatch.setattr(economic_calendar.time, "sleep", lambda s: None)
+    monkeypatch.setattr("builtins.print", lambda msg="", end="\n": None)
+
+    result = fetch_event_result("http://example.com", delay_range=(0, 0), poll_interval=0, max_attempts=3)
+    assert result.actual == 1.5
+    assert sent_headers == [None, '"v1"', '"v1"']
+
+
+def test_fetch_event_results_async_polls_events_concurrently(monkeypatch):
+    import asyncio
+
+    pages = {
+        "http://example.com/a": '<td class="actual">1.5%</td><td class="forecast">1.2%</td>',
+        "http://example.com/b": '<td class="actual">-0.4</td><td class="previous">0.1</td>',
+    }
+
+    class DummyResp:
+        headers = {}
+
+        def __init__(self, html):
+            self.html = html
+
+        def read(self):
+            return self.html.encode("utf-8")
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            pass
+
+    monkeypatch.setattr(economic_calendar, "aiohttp", None)
+    monkeypatch.setattr(economic_calendar, "urlopen", lambda request, timeout=10: DummyResp(pages[request.full_url]))
+    monkeypatch.setattr("builtins.print", lambda msg="", end="\n": None)
+
+    results = asyncio.run(
+        economic_calendar.fetch_event_results_async(list(pages), delay_range=(0, 0), poll_interval=0, max_attempts=1)
+    )
+    assert [r.actual for r in results] == [1.5, -0.4]
+    assert results[1].diff_previous == pytest.approx(-0.5)
+
+
+def test_parse_event_page_without_value_cells():
+    result = parse_event_page("<html><body>Event pending</body></html>")
+    assert result == CalendarEventResult(None, None, None, None, None)
@@ -0,0 +1,242 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from eafix.guardian.guardian_implementation import (
+    CircuitBreaker,
+    CircuitBreakerState,
+    GuardianConfig,
+    GuardianOrchestrator,
+    SystemMode,
+    _insert_rows,
+)
+
+
+def _guardian(tmp_path):
+    config = GuardianConfig(
+        pulse_interval_seconds=0.05,
+        health_check_interval_seconds=0.05,
+        db_path=str(tmp_path / "guardian.db"),
+    )
+    return GuardianOrchestrator(config)
+
+
+def test_health_log_rows_are_written_by_the_writer_thread(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian.start_monitoring()
+    time.sleep(0.3)
+    guardian.stop_monitoring()
+
+    with sqlite3.connect(guardian.config.db_path) as conn:
+        rows = conn.execute("SELECT status, details FROM health_log").fetchall()
+    assert rows
+    assert all(status in ("OK", "WARNING", "CRITICAL") for status, _ in rows)
+    assert all(json.loads(details)["overall_status"] == status for status, details in rows)
+    assert guardian._db_writer is None
+
+
+def test_database_uses_configured_journal_mode(tmp_path):
+    guardian = _guardian(tmp_path)
+    with sqlite3.connect(guardian.config.db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_circuit_breaker_reopens_for_calls_after_timeout():
+    cb = CircuitBreaker("dde_connection", failure_threshold=1, timeout_seconds=0.05, half_open_max_calls=1)
+    with pytest.raises(ZeroDivisionError):
+        cb.call(lambda: 1 / 0)
+    assert cb.state is CircuitBreakerState.OPEN
+    with pytest.raises(Exception, match="is OPEN"):
+        cb.call(lambda: 1)
+
+    time.sleep(0.06)
+    assert cb.call(lambda: 1) == 1
+    assert cb.state is CircuitBreakerState.CLOSED
+    assert cb.last_failure_time is not None
+
+
+def test_check_reports_iso_timestamps(tmp_path):
+    status = _guardian(tmp_path).check()
+    datetime.fromisoformat(status["timestamp"])
+    for component in status["components"].values():
+        datetime.fromisoformat(component["timestamp"])
+
+
+def test_circuit_breaker_counts_concurrent_failures_once_each():
+    cb = CircuitBreaker("ea_bridge", failure_threshold=1000)
+
+    def fail_many():
+        for _ in range(200):
+            with pytest.raises(ZeroDivisionError):
+                cb.call(lambda: 1 / 0)
+
+    threads = [threading.Thread(target=fail_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cb.failure_count == 800
+    assert cb.state is CircuitBreakerState.CLOSED
+
+
+def test_alert_history_is_bounded(tmp_path):
+    guardian = _guardian(tmp_path)
+    critical = {"components": {"database": {"status": "CRITICAL", "message": "down"}}}
+    for _ in range(150):
+        guardian._process_alerts(critical)
+
+    assert len(guardian.alerts) == 100
+    assert guardian.alerts[-10:] == guardian.recent_alerts(10)
+    assert len(guardian.check()["alerts"]) == 10
+
+
+
+def test_component_failure_alerts(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian._process_alerts({"components": {
+        "database": {"status": "CRITICAL", "message": "down"},
+        "ea_bridge": {"status": "CRITICAL"},
+        "disk_space": {"status": "OK"},
+    }})
+
+    first, second = guardian.alerts
+    assert list(first) == ["timestamp", "type", "component", "message", "severity"]
+    assert (first["component"], first["message"], first["severity"]) == ("database", "down", "HIGH")
+    assert second["message"] == "ea_bridge critical failure"
+    assert guardian._alert_templates["ea_bridge"]["message"] == "ea_bridge critical failure"
+
+
+def test_slow_component_check_times_out(tmp_path, monkeypatch):
+    guardian = _guardian(tmp_path)
+    guardian.config.component_check_timeout_seconds = 0.1
+    monkeypatch.setitem(guardian._component_checks, "ea_bridge", lambda: time.sleep(1) or {"status": "OK"})
+
+    started = time.monotonic()
+    status = guardian.check()
+    assert time.monotonic() - started < 0.9
+    assert status["components"]["ea_bridge"]["status"] == "ERROR"
+    assert list(status["components"]) == [
+        "dde_connection", "ea_bridge", "transport_layer", "database", "disk_space", "memory_usage"
+    ]
+    guardian.close()
+
+
+def test_hung_component_check_is_not_resubmitted(tmp_path, monkeypatch):
+    guardian = _guardian(tmp_path)
+    guardian.config.component_check_timeout_seconds = 0.2
+    release = threading.Event()
+    calls = []
+
+    def hung_check():
+        calls.append(1)
+        release.wait(5)
+        return {"status": "OK"}
+
+    monkeypatch.setitem(guardian._component_checks, "ea_bridge", hung_check)
+    try:
+        for _ in range(8):
+            status = guardian.check()
+            errors = [name for name, c in status["components"].items() if c["status"] == "ERROR"]
+            assert errors == ["ea_bridge"]
+        assert len(calls) == 1
+        assert guardian.mode is SystemMode.DEGRADED
+    finally:
+        release.set()
+        guardian.close()
+    assert guardian._check_pool is None
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/meminfo"), reason="needs /proc/meminfo")
+def test_memory_check_reads_proc_meminfo_without_psutil(tmp_path):
+    status = _guardian(tmp_path)._check_memory_usage()
+    assert status["status"] in ("OK", "WARNING", "CRITICAL")
+    assert 0.0 <= status["memory_percent"] <= 100.0
+    assert status["available_mb"] > 0
+
+
+def test_recorded_metrics_are_immutable_snapshots(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian._record_metric("system_pulse", 1.0, 1.0, "OK")
+    first = guardian.health_metrics["system_pulse"]
+    guardian._record_metric("system_pulse", 0.0, 1.0, "CRITICAL")
+
+    assert first.status == "OK"
+    assert guardian.health_metrics["system_pulse"].status == "CRITICAL"
+    with pytest.raises(AttributeError):
+        first.status = "WARNING"
+
+
+def _alert_rows(guardian):
+    with sqlite3.connect(guardian.config.db_path) as conn:
+        return conn.execute("SELECT type, component, message, severity FROM alert_log ORDER BY id").fetchall()
+
+
+def test_alerts_are_persisted_without_monitoring(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian._process_alerts({"components": {"database": {"status": "CRITICAL", "message": "down"}}})
+    guardian._set_mode(SystemMode.SAFE_MODE)
+
+    assert _alert_rows(guardian) == [
+        ("COMPONENT_FAILURE", "database", "down", "HIGH"),
+        ("MODE_CHANGE", None, "System mode changed from NORMAL to SAFE_MODE", "HIGH"),
+    ]
+    assert guardian._log_queue.empty()
+
+
+def test_alerts_raised_while_monitoring_are_written_on_stop(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian.start_monitoring()
+    guardian._set_mode(SystemMode.SAFE_MODE)
+    guardian.stop_monitoring()
+
+    assert ("MODE_CHANGE", None, "System mode changed from NORMAL to SAFE_MODE", "HIGH") in _alert_rows(guardian)
+    assert guardian._log_queue.empty()
+
+
+def test_health_rows_are_written_without_monitoring(tmp_path):
+    guardian = _guardian(tmp_path)
+    guardian._log_health_status(guardian.check())
+    guardian.close()
+
+    with sqlite3.connect(guardian.config.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM health_log").fetchone()[0] == 1
+    assert guardian._log_queue.empty()
+
+
+def test_writer_setup_failure_falls_back_to_synchronous_writes(tmp_path, monkeypatch):
+    guardian = _guardian(tmp_path)
+    apply_pragmas = guardian._apply_pragmas
+    calls = []
+
+    def failing_once(conn):
+        calls.append(conn)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("disk I/O error")
+        apply_pragmas(conn)
+
+    monkeypatch.setattr(guardian, "_apply_pragmas", failing_once)
+    monkeypatch.setattr(guardian, "_health_monitor", lambda: None)
+    monkeypatch.setattr(guardian, "_pulse_monitor", lambda: None)
+    guardian.start_monitoring()
+    deadline = time.monotonic() + 5
+    while guardian._db_writer is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert guardian._db_writer is None
+    guardian._log_health_status({"timestamp": "t", "overall_status": "OK"})
+    with sqlite3.connect(guardian.config.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM health_log").fetchone()[0] == 1
+    guardian.stop_monitoring()
+
+
+def test_insert_rows_uses_multi_row_statements_in_order():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (a, b)")
+    rows = [(i, str(i)) for i in range(173)]  # 128 + 32 + 8 + 5
+    _insert_rows(conn, "INSERT INTO t (a, b) VALUES (?, ?)", rows)
+    assert conn.execute("SELECT a, b FROM t ORDER BY rowid").fetchall() == rows
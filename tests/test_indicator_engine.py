@@ -8,3 +8,43 @@ def test_indicator_engine_updates():
     out = engine.update("EURUSD", 1.2345)
     assert "StrengthRSIIndicator" in out
     assert isinstance(out["StrengthRSIIndicator"], float)
+
+
+def test_update_many_matches_per_symbol_updates():
+    single, batched = IndicatorEngine(), IndicatorEngine()
+    for engine in (single, batched):
+        for symbol in ("EURUSD", "GBPUSD"):
+            for ind in default_strength_indicators():
+                engine.add_indicator(symbol, ind)
+
+    for step in range(30):
+        snapshot = {"EURUSD": 1.0 + step * 0.01, "GBPUSD": 1.3 - step * 0.02, "USDJPY": 150.0}
+        expected = {symbol: single.update(symbol, value) for symbol, value in snapshot.items()}
+        assert batched.update_many(snapshot) == expected
+    assert batched.update_many({"USDJPY": 150.0}) == {"USDJPY": {}}
+
+
+def test_strength_rsi_matches_window_formula():
+    from eafix.indicators import StrengthRSIIndicator
+
+    series = [1.0, 1.2, 1.1, 1.1, 1.4, 1.3, 1.0, 0.9, 1.2, 1.5, 1.5, 1.6]
+    period = 4
+    rsi = StrengthRSIIndicator(period)
+    outputs = [rsi.update(v) for v in series]
+
+    assert outputs[:period] == [0.0] * period
+    for end in range(period, len(series)):
+        window = series[end - period:end + 1]
+        changes = [b - a for a, b in zip(window, window[1:])]
+        gain = sum(max(0.0, c) for c in changes) / period
+        loss = sum(max(0.0, -c) for c in changes) / period
+        expected = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+        assert outputs[end] == expected
+
+
+def test_performance_metrics_refresh_after_window():
+    engine = IndicatorEngine(ui_refresh_ms=0)
+    engine.add_indicator("EURUSD", default_strength_indicators()[0])
+    engine.update("EURUSD", 1.0)
+    assert engine.performance["updates"] == 1
+    assert engine.performance["elapsed_ms"] >= 0.0
@@ -0,0 +1,125 @@
+import gc
+import json
+import sqlite3
+import time
+import weakref
+
+from eafix.guardian.agents.learning_agent import LearningAgent
+
+
+def _count(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_flush_writes_queued_events(tmp_path):
+    db_path = tmp_path / "learning.db"
+    agent = LearningAgent(str(db_path))
+    for _ in range(5):
+        agent.record({"type": "trade", "data": {"symbol": "EURUSD"}, "outcome": "success"})
+
+    agent.flush()
+    assert _count(db_path, "learning_events") == 5
+    assert _count(db_path, "patterns") == 1
+    agent.close()
+
+
+def test_background_writer_stores_queued_events(tmp_path):
+    db_path = tmp_path / "learning.db"
+    agent = LearningAgent(str(db_path))
+    agent.record({"type": "trade", "data": {"bad": object()}})
+    for _ in range(4):
+        agent.record({"type": "trade", "data": {}})
+
+    deadline = time.monotonic() + 5
+    while _count(db_path, "learning_events") < 4 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _count(db_path, "learning_events") == 4
+    agent.close()
+
+
+def test_patterns_reload_after_close(tmp_path):
+    db_path = tmp_path / "learning.db"
+    agent = LearningAgent(str(db_path))
+    for _ in range(6):
+        agent.record({"type": "trade", "outcome": "profit"})
+    agent.close()
+
+    reloaded = LearningAgent(str(db_path))
+    pattern = reloaded.patterns["trade_profit"]
+    assert pattern.occurrences == 6
+    assert pattern.success_rate == 1.0
+    reloaded.close()
+
+
+def test_close_is_idempotent(tmp_path):
+    agent = LearningAgent(str(tmp_path / "learning.db"))
+    agent.record({"type": "trade"})
+    agent.close()
+    agent.close()
+    assert agent.conn is None
+
+
+def test_predict_outcome_uses_most_confident_pattern_of_type(tmp_path):
+    agent = LearningAgent(str(tmp_path / "learning.db"))
+    agent.min_confidence_threshold = 0.0
+    for _ in range(5):
+        agent.record({"type": "trade", "outcome": "profit"})
+    for _ in range(8):
+        agent.record({"type": "trade", "outcome": "success"})
+    for _ in range(20):
+        agent.record({"type": "signal", "outcome": "completed"})
+
+    assert [p.pattern_id for p in agent.get_patterns("trade")] == ["trade_success", "trade_profit"]
+    assert agent.predict_outcome("trade", {}) == ("success", 0.08)
+    assert agent.predict_outcome("unknown", {}) is None
+    assert len(agent.get_patterns()) == 3
+    agent.close()
+
+
+def test_use_after_close_does_not_raise(tmp_path):
+    agent = LearningAgent(str(tmp_path / "learning.db"))
+    agent.close()
+    agent.record({"type": "trade", "outcome": "success"})
+    agent.flush()
+    agent.cleanup_old_data()
+    assert len(agent.events) == 1
+
+
+def test_unopenable_database_keeps_learning_in_memory(tmp_path):
+    agent = LearningAgent(str(tmp_path))  # A directory cannot be opened as a database
+    assert agent.conn is None
+    for _ in range(5):
+        agent.record({"type": "trade", "outcome": "success"})
+    agent.flush()
+    assert "trade_success" in agent.patterns
+    agent.close()
+
+
+def test_dropped_agent_is_collected_and_flushed(tmp_path):
+    db_path = tmp_path / "learning.db"
+    agent = LearningAgent(str(db_path))
+    agent.record({"type": "trade"})
+    ref = weakref.ref(agent)
+    del agent
+
+    deadline = time.monotonic() + 5
+    while ref() is not None and time.monotonic() < deadline:
+        gc.collect()
+        time.sleep(0.01)
+    assert ref() is None
+    assert _count(db_path, "learning_events") == 1
+
+
+def test_recorded_event_is_not_affected_by_later_mutation(tmp_path):
+    db_path = tmp_path / "learning.db"
+    agent = LearningAgent(str(db_path))
+    data = {"symbol": "EURUSD", "legs": [1]}
+    agent.record({"type": "trade", "data": data})
+    data["symbol"] = "GBPUSD"
+    data["legs"].append(2)
+    agent.close()
+
+    with sqlite3.connect(db_path) as conn:
+        stored = conn.execute("SELECT data FROM learning_events").fetchone()[0]
+    assert json.loads(stored) == {"symbol": "EURUSD", "legs": [1]}